@@ -1,19 +1,194 @@
-from fastapi import FastAPI, HTTPException
-from utils.scraper import fetch_news, extract_topics
-from utils.extract_topics import extract_topics
-from utils.comparative_analysis import generate_comparative_analysis
-from utils.sentiment_analysis import compare_sentiment
-from utils.tts_generator import generate_tts
-from typing import Dict, List, Union, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import time
+import weakref
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from utils.extract_topics import extract_topics, extract_topics_many
+from utils.pipeline import (
+    analysis_cache, analyze_companies, company_key, get_company_analysis, iter_company_events,
+    refresh_company, tts_summary_text
+)
+from utils.prefetch import PrefetchScheduler, load_watchlist
+from utils.upstream import BREAKER_COOLDOWN, FETCH_BUDGET, Deadline
+from utils.tts_generator import iter_file, open_tts
+from utils.article_store import article_store
+from utils import metrics, upstream, warmup
+from utils.execution import (
+    ConcurrencyLimiter, RETRY_AFTER_SECONDS, map_cpu_async, run_cpu_async, shutdown_pool, start_pool
+)
+from typing import Dict, List, Literal, Union, Optional
+from pydantic import BaseModel
+
+# LOG_LEVEL=WARNING silences the per-request progress messages
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 app = FastAPI()
 
+# Largest watchlist accepted by one batch request
+MAX_BATCH_COMPANIES = int(os.environ.get("MAX_BATCH_COMPANIES", "500"))
+
+class BatchNewsRequest(BaseModel):
+    companies: List[str]
+
+# Largest number of texts accepted by one topic extraction batch
+MAX_TOPIC_BATCH_TEXTS = int(os.environ.get("MAX_TOPIC_BATCH_TEXTS", "1000"))
+
+class TopicsBatchRequest(BaseModel):
+    texts: List[str]
+    max_keywords: int = 5
+    language: str = "en"
+    ngram_size: int = 2
+    dedup_lim: float = 0.7
+
+# How long clients may reuse TTS audio before revalidating with its ETag
+TTS_MAX_AGE = int(os.environ.get("TTS_MAX_AGE", "300"))
+
+# Status of an analysis error by its upstream failure reason; other errors (no news) are 404
+ERROR_STATUS = {"deadline_exceeded": 504, "circuit_open": 503, "upstream_error": 503}
+
+# Bounds the expensive requests in flight; extra ones get 503 + Retry-After
+request_limiter = ConcurrencyLimiter()
+
+# Keeps the WATCHLIST companies' analyses in the cache ahead of requests
+prefetcher = PrefetchScheduler(load_watchlist(), refresh_company, key=company_key)
+
+async def warm_up_app():
+    """Load the NLP backends here and in every worker; /ready reports the outcome."""
+    results = await run_in_threadpool(warmup.warm_up)
+    try:
+        workers = await run_in_threadpool(start_pool)
+    except Exception as e:
+        logging.getLogger(__name__).warning("Worker pool failed to start: %s", e)
+        workers = None
+    if workers is None:
+        results["workers"] = {"ok": False, "error": "worker pool failed to start"}
+    elif workers:
+        failed = sorted({name for state in workers.values() for name, result in state["backends"].items()
+                         if not result["ok"]})
+        results["workers"] = {"ok": not failed, "count": len(workers)}
+        if failed:
+            results["workers"]["error"] = f"warm-up failed in workers: {', '.join(failed)}"
+    warmup.mark_finished(results)
+    # Prefetch once the models are loaded, so refreshes don't compete with warm-up
+    prefetcher.start()
+
+@app.on_event("startup")
+async def start_workers():
+    # Warm up in the background: the server accepts connections at once and
+    # /ready turns 200 when the models are loaded
+    app.state.warmup_task = asyncio.get_running_loop().create_task(warm_up_app())
+
+@app.on_event("shutdown")
+def stop_workers():
+    prefetcher.stop()
+    shutdown_pool()
+
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    """Time every request and report its per-stage breakdown in a Server-Timing header."""
+    if not metrics.METRICS_ENABLED:
+        return await call_next(request)
+
+    token = metrics.start_request()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        timings = metrics.end_request(token)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    metrics.observe(route.path if route is not None else "unmatched", elapsed, family="http")
+    timings["total"] = (elapsed, 1)
+    response.headers["Server-Timing"] = metrics.server_timing(timings)
+    return response
+
+@asynccontextmanager
+async def request_slot():
+    """Hold one of the limited request slots, or fail fast with 503."""
+    if not request_limiter.try_acquire():
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+    try:
+        yield
+    finally:
+        request_limiter.release()
+
+def analysis_error(result: Dict) -> HTTPException:
+    """
+    HTTPException for an analysis error: 504 when the fetch budget ran out,
+    503 with Retry-After when the feed host is failing, 404 otherwise.
+    """
+    reason = result.get("reason")
+    status_code = ERROR_STATUS.get(reason, 404)
+    headers = None
+    if status_code == 503:
+        retry_after = BREAKER_COOLDOWN if reason == "circuit_open" else RETRY_AFTER_SECONDS
+        headers = {"Retry-After": str(int(retry_after))}
+    return HTTPException(status_code=status_code, detail=result["error"], headers=headers)
+
+def freshness(key: str) -> Dict:
+    """When the cached analysis for a key was computed, and whether the prefetcher keeps it warm."""
+    computed_at = analysis_cache.stored_at(key) or time.time()
+    return {
+        "computed_at": datetime.fromtimestamp(computed_at, timezone.utc).isoformat(),
+        "age_seconds": round(time.time() - computed_at, 1),
+        "max_age_seconds": analysis_cache.ttl,
+        "watchlisted": prefetcher.watches(key),
+    }
+
+async def load_company_analysis(company_name: str) -> Dict:
+    """Company analysis from cache, or computed off the event loop within a request slot."""
+    key = company_key(company_name)
+    prefetcher.record_request(company_name)
+    cached = analysis_cache.get(key)
+    if cached is None:
+        async with request_slot():
+            # The fetch budget starts once the request holds a slot
+            cached = await run_in_threadpool(get_company_analysis, company_name, Deadline(FETCH_BUDGET))
+
+    # Check if there was an error
+    if isinstance(cached, dict) and "error" in cached:
+        raise analysis_error(cached)
+    # A copy: the cached dict is shared between requests
+    return dict(cached, freshness=freshness(key))
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the News Analysis API"}
 
+@app.get("/ready")
+def get_ready():
+    """
+    Readiness probe: 200 once warm-up has loaded every backend, 503 before or if one failed.
+    Also reports the circuit breaker state of each feed host.
+    """
+    body = {"ready": warmup.state["ready"], "warmed_up": warmup.state["finished"],
+            "backends": warmup.state["backends"], "upstream": upstream.stats()}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Stage and request latency histograms and event counters, in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/prefetch")
+def get_prefetch_status():
+    """Watchlist companies with their request counts, last refresh time and last error."""
+    return {"interval_seconds": prefetcher.interval, "companies": prefetcher.status()}
+
 @app.get("/fetch-news/{company_name}")
-def get_news(company_name: str) -> Dict[str, Union[List[Dict], Dict]]:
+async def get_news(company_name: str) -> Dict[str, Union[List[Dict], Dict]]:
     """
     Fetch and analyze news articles for a given company.
     Returns:
@@ -21,61 +196,95 @@ def get_news(company_name: str) -> Dict[str, Union[List[Dict], Dict]]:
         - Topic analysis for each article
         - Sentiment analysis across all articles
         - Comparative analysis between articles
+        - Freshness: when the analysis was computed and its age in seconds
     """
-    result = fetch_news(company_name)
-    
-    # Check if there was an error
-    if isinstance(result, dict) and "error" in result:
-        raise HTTPException(status_code=404, detail=result["error"])
-    
-    articles = result["articles"]
-    
-    # Process articles and add topics
-    for article in result["articles"]:
-        article["topics"] = extract_topics(article.get("content", ""))
-    
-    # Perform sentiment analysis
-    sentiment_analysis = compare_sentiment(articles)
-    
-    # Generate comparative analysis
-    comparative = generate_comparative_analysis(articles)
-    
-    # Format comparative analysis for frontend compatibility
-    comparative_analysis = {
-        "coverage_summary": comparative["thematic_summary"],
-        "insights": [
-            f"Comparison {i+1}: {comp['comparison']} - {comp['impact']}"
-            for i, comp in enumerate(comparative["article_comparisons"])
-        ],
-        "key_differences": comparative["key_differences"],
-        "article_comparisons": comparative["article_comparisons"],
-        "source_distribution": {
-            "sources": [{"name": source, "count": count} for source, count in comparative["source_distribution"].items()],
-            "total_sources": len(comparative["source_distribution"])
-        }
-    }
-    
-    # Structure the complete response
-    complete_response = {
-        "articles": articles,
-        "analysis": result["analysis"],
-        "sentiment_analysis": sentiment_analysis,
-        "comparative_analysis": comparative_analysis
-    }
-    
-    return complete_response
+    return await load_company_analysis(company_name)
+
+def format_event(event: str, data, fmt: str) -> str:
+    """Encode one analysis event as an NDJSON line or a Server-Sent Event."""
+    payload = json.dumps(data, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+
+@app.get("/fetch-news/{company_name}/stream")
+def stream_news(company_name: str, format: Literal["ndjson", "sse"] = "ndjson"):
+    """
+    Stream a company's analysis as it is produced.
+    Each article is sent as soon as it is fetched and annotated, followed by
+    the analysis, sentiment_analysis and comparative_analysis sections and a
+    final done (or error) event. format=ndjson sends one {"event", "data"}
+    object per line; format=sse sends Server-Sent Events.
+    """
+    if not request_limiter.try_acquire():
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+
+    prefetcher.record_request(company_name)
+
+    deadline = Deadline(FETCH_BUDGET)
+    release = request_limiter.releaser()
+
+    def events():
+        # The slot is held until the last event is sent or the client goes away
+        try:
+            for event, data in iter_company_events(company_name, deadline=deadline):
+                yield format_event(event, data, format)
+        finally:
+            release()
+
+    body = events()
+    # A body that is never iterated (client gone before it started) never
+    # reaches the finally above; release the slot when it is discarded
+    weakref.finalize(body, release)
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+@app.post("/fetch-news/batch")
+async def get_news_batch(payload: BatchNewsRequest) -> Dict:
+    """
+    Fetch and analyze news for a list of companies in one call.
+    Returns per-company results in the same shape as /fetch-news/{company_name};
+    companies without articles get an 'error' entry instead, with a 'reason'
+    when their feeds failed. Each company gets the full fetch budget.
+    """
+    if len(payload.companies) > MAX_BATCH_COMPANIES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_COMPANIES} companies per batch.")
+
+    async with request_slot():
+        return await run_in_threadpool(analyze_companies, payload.companies, FETCH_BUDGET)
+
+@app.get("/articles")
+async def search_articles(about: Optional[str] = None, since: Optional[datetime] = None,
+                          company: Optional[str] = None, kind: Optional[Literal["topic", "entity"]] = None,
+                          limit: int = 50) -> Dict:
+    """
+    Search previously analyzed articles without fetching any feed.
+    - about: topic or entity (word or phrase, case-insensitive)
+    - since: ISO 8601 date/time; older articles are left out
+    - company: only articles fetched for this company
+    """
+    articles = await run_in_threadpool(
+        article_store.search,
+        about,
+        since.timestamp() if since else None,
+        company_key(company) if company else None,
+        kind,
+        max(1, min(limit, 500))
+    )
+    return {"articles": articles, "count": len(articles)}
 
 @app.get("/tts/{company}")
-def get_tts(company: str):
+async def get_tts(company: str, request: Request):
     """
     Generate Hindi TTS summary for company news sentiment.
+    Streams the MP3 bytes; the ETag is the audio's content hash.
     """
     company = company.strip()
-    result = fetch_news(company)
-
-    # Check if there was an error
-    if isinstance(result, dict) and "error" in result:
-        raise HTTPException(status_code=404, detail=result["error"])
+    result = await load_company_analysis(company)
 
     # Get articles from the result
     articles = result["articles"]
@@ -83,39 +292,53 @@ def get_tts(company: str):
     if not articles:
         raise HTTPException(status_code=404, detail="No valid news articles found.")
 
-    # Perform sentiment analysis
-    sentiment_data = compare_sentiment(articles)
-    
-    # Create a more detailed summary
-    summary_text = (
-        f"कंपनी {company} के लिए समाचार विश्लेषण। "
-        f"कुल {len(articles)} समाचार लेख मिले, जिनमें से "
-        f"{sentiment_data['sentiment_distribution']['Positive']} सकारात्मक, "
-        f"{sentiment_data['sentiment_distribution']['Negative']} नकारात्मक, और "
-        f"{sentiment_data['sentiment_distribution']['Neutral']} तटस्थ हैं। "
-        f"समग्र भावना {sentiment_data['overall_sentiment']['category']} है।"
-    )
+    # Built from the sentiment analysis computed with the articles
+    summary_text = tts_summary_text(company, result)
 
-    file_path = generate_tts(summary_text)
+    # gTTS is a blocking network call; the file is opened before it can be evicted
+    audio = await run_in_threadpool(open_tts, summary_text)
 
-    if not file_path:
+    if not audio:
         raise HTTPException(status_code=500, detail="Failed to generate TTS file.")
 
-    return {"message": "TTS generated", "file": file_path}
+    etag = '"' + os.path.splitext(os.path.basename(audio.name))[0] + '"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={TTS_MAX_AGE}"}
+    if request.headers.get("if-none-match") == etag:
+        audio.close()
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Length"] = str(os.fstat(audio.fileno()).st_size)
+    return StreamingResponse(iter_file(audio), media_type="audio/mpeg", headers=headers)
 
 
 @app.post("/extract-topics/")
 async def get_topics(payload: dict):
     text = payload.get("text", "").strip()
-    print("🟢 Received Text for Topic Extraction:", repr(text))
 
     if not text:
         return {"topics": ["No valid content to extract topics"]}
 
-    topics = extract_topics(text)
-
-    print("🟢 Extracted Topics Before Returning:", topics)  # Debugging
+    # YAKE is CPU-bound; keep it off the event loop
+    topics = await run_cpu_async(extract_topics, text)
 
     return {"topics": topics}
 
+@app.post("/extract-topics/batch")
+async def get_topics_batch(payload: TopicsBatchRequest) -> Dict:
+    """
+    Extract topics from many texts with one configuration.
+    Returns {"topics": [...]} with one list per input text, in order.
+    Repeated texts are extracted once; the rest are spread over the worker pool.
+    """
+    if len(payload.texts) > MAX_TOPIC_BATCH_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_TOPIC_BATCH_TEXTS} texts per batch.")
 
+    texts = [text.strip() for text in payload.texts]
+    unique = list(dict.fromkeys(texts))
+    async with request_slot():
+        topics = await map_cpu_async(
+            extract_topics_many, unique,
+            payload.max_keywords, payload.language, payload.ngram_size, payload.dedup_lim
+        )
+    by_text = dict(zip(unique, topics))
+    return {"topics": [by_text[text] for text in texts]}
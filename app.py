@@ -1,12 +1,20 @@
+import os
 import streamlit as st
 import requests
 import pandas as pd
 import plotly.express as px
-from datetime import datetime
-import uvicorn
-from api import app  # Import your FastAPI app from api.py
-import spacy
-import os
+
+# "inprocess" runs the analysis pipeline inside Streamlit; "http" calls a
+# separately deployed API server at API_URL
+APP_MODE = os.environ.get("APP_MODE", "inprocess")
+API_URL = os.environ.get("API_URL", "http://127.0.0.1:8000")
+# Seconds a company's results are reused across reruns and sessions
+APP_CACHE_TTL = float(os.environ.get("APP_CACHE_TTL", os.environ.get("ANALYSIS_CACHE_TTL", "300")))
+
+if APP_MODE == "inprocess":
+    # Run the NLP stages in this process, on the models load_models keeps,
+    # instead of loading them again in a pool of worker processes
+    os.environ["ANALYSIS_WORKERS"] = "0"
 
 # Configure the page
 st.set_page_config(
@@ -59,104 +67,138 @@ st.sidebar.header("Settings")
 company = st.sidebar.text_input("Enter Company Name", "")
 analyze_button = st.sidebar.button("Analyze News")
 
-# API endpoint
-BASE_URL = "http://127.0.0.1:8000"
+@st.cache_resource(show_spinner="Loading NLP models...")
+def load_models():
+    """
+    Load the NLP models once per Streamlit process (in-process mode).
+    The models stay in this process's shared model registries; the
+    returned warm-up report is what Streamlit caches.
+    """
+    from utils.warmup import warm_up
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+    return warm_up()
 
-if analyze_button and company:
-    with st.spinner('Fetching and analyzing news articles...'):
-        try:
-            # Fetch news analysis
-            response = requests.get(f"{BASE_URL}/fetch-news/{company.strip()}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Display overall sentiment analysis
-                st.header("📊 Overall Sentiment Analysis")
-                col1, col2, col3 = st.columns(3)
-                
-                sentiment_dist = data["sentiment_analysis"]["sentiment_distribution"]
-                with col1:
-                    st.metric("Positive Articles", sentiment_dist["Positive"])
-                with col2:
-                    st.metric("Negative Articles", sentiment_dist["Negative"])
-                with col3:
-                    st.metric("Neutral Articles", sentiment_dist["Neutral"])
-                
-                # Create sentiment distribution pie chart
-                df_sentiment = pd.DataFrame({
-                    'Sentiment': list(sentiment_dist.keys()),
-                    'Count': list(sentiment_dist.values())
-                })
-                fig = px.pie(df_sentiment, values='Count', names='Sentiment',
-                           title='Sentiment Distribution',
-                           color_discrete_map={'Positive': '#28a745',
-                                             'Negative': '#dc3545',
-                                             'Neutral': '#6c757d'})
-                st.plotly_chart(fig)
-                
-                # Display comparative analysis insights
-                st.header("🔍 Comparative Analysis")
-                for insight in data["comparative_analysis"]["insights"]:
-                    st.info(insight)
+@st.cache_data(ttl=APP_CACHE_TTL, show_spinner=False)
+def load_analysis(company):
+    """
+    A company's analysis, computed once per APP_CACHE_TTL and reused by every rerun.
+    Raises RuntimeError when no analysis is available; errors are not cached.
+    """
+    if APP_MODE == "http":
+        response = requests.get(f"{API_URL}/fetch-news/{company}")
+        if response.status_code != 200:
+            raise RuntimeError("Error fetching news. Please try again with a different company name.")
+        return response.json()
+
+    from utils.pipeline import get_company_analysis
+
+    load_models()
+    result = get_company_analysis(company)
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+@st.cache_data(ttl=APP_CACHE_TTL, show_spinner=False)
+def load_tts(company):
+    """MP3 bytes of the Hindi summary, built from the cached analysis instead of fetching news again."""
+    if APP_MODE == "http":
+        response = requests.get(f"{API_URL}/tts/{company}")
+        if response.status_code != 200:
+            raise RuntimeError("Failed to generate Hindi summary.")
+        return response.content
+
+    from utils.pipeline import tts_summary_text
+    from utils.tts_generator import open_tts
+
+    audio = open_tts(tts_summary_text(company, load_analysis(company)))
+    if not audio:
+        raise RuntimeError("Failed to generate Hindi summary.")
+    with audio:
+        return audio.read()
+
+# Keep showing the last analyzed company on reruns (widget changes, expanders);
+# the cached functions above make those reruns cache reads
+if analyze_button and company.strip():
+    st.session_state["company"] = company.strip()
+selected = st.session_state.get("company")
+
+if selected:
+    try:
+        with st.spinner('Fetching and analyzing news articles...'):
+            data = load_analysis(selected)
+    except Exception as e:
+        st.error(str(e))
+        data = None
+
+    if data is not None:
+        # Display overall sentiment analysis
+        st.header("📊 Overall Sentiment Analysis")
+        col1, col2, col3 = st.columns(3)
+        
+        sentiment_dist = data["sentiment_analysis"]["sentiment_distribution"]
+        with col1:
+            st.metric("Positive Articles", sentiment_dist["Positive"])
+        with col2:
+            st.metric("Negative Articles", sentiment_dist["Negative"])
+        with col3:
+            st.metric("Neutral Articles", sentiment_dist["Neutral"])
+        
+        # Create sentiment distribution pie chart
+        df_sentiment = pd.DataFrame({
+            'Sentiment': list(sentiment_dist.keys()),
+            'Count': list(sentiment_dist.values())
+        })
+        fig = px.pie(df_sentiment, values='Count', names='Sentiment',
+                   title='Sentiment Distribution',
+                   color_discrete_map={'Positive': '#28a745',
+                                     'Negative': '#dc3545',
+                                     'Neutral': '#6c757d'})
+        st.plotly_chart(fig)
+        
+        # Display comparative analysis insights
+        st.header("🔍 Comparative Analysis")
+        for insight in data["comparative_analysis"]["insights"]:
+            st.info(insight)
+        
+        # Display source distribution
+        st.subheader("📰 News Sources")
+        sources = data["comparative_analysis"]["source_distribution"]["sources"]
+        df_sources = pd.DataFrame({
+            'Source': [source["name"] for source in sources],
+            'Articles': [source["count"] for source in sources]
+        })
+        st.bar_chart(df_sources.set_index('Source'))
+        
+        # Display articles
+        st.header("📑 News Articles")
+        for article in data["articles"]:
+            with st.expander(f"{article['title']}"):
+                st.markdown(f"**Summary:** {article.get('summary', '')}")
+                st.markdown(f"**Source:** {article.get('source', 'Unknown')}")
+                st.markdown(f"**Published:** {article.get('publish_date') or 'Date not available'}")
                 
-                # Display source distribution
-                st.subheader("📰 News Sources")
-                source_dist = data["comparative_analysis"]["source_distribution"]
-                df_sources = pd.DataFrame({
-                    'Source': list(source_dist.keys()),
-                    'Articles': list(source_dist.values())
-                })
-                st.bar_chart(df_sources.set_index('Source'))
+                sentiment = article["sentiment"]
+                sentiment_color = ("sentiment-positive" if sentiment["category"] == "Positive"
+                                 else "sentiment-negative" if sentiment["category"] == "Negative"
+                                 else "sentiment-neutral")
+                st.markdown(f"**Sentiment:** <span class='{sentiment_color}'>{sentiment['category']} ({sentiment['score']})</span>",
+                          unsafe_allow_html=True)
                 
-                # Display articles
-                st.header("📑 News Articles")
-                for article in data["articles"]:
-                    with st.expander(f"{article['title']}"):
-                        st.markdown(f"**Summary:** {article['summary']}")
-                        st.markdown(f"**Source:** {article.get('source', 'Unknown')}")
-                        st.markdown(f"**Published:** {article.get('publish_date', 'Date not available')}")
-                        
-                        sentiment = article["sentiment"]
-                        sentiment_color = ("sentiment-positive" if sentiment["category"] == "Positive"
-                                         else "sentiment-negative" if sentiment["category"] == "Negative"
-                                         else "sentiment-neutral")
-                        st.markdown(f"**Sentiment:** <span class='{sentiment_color}'>{sentiment['category']} ({sentiment['score']})</span>",
-                                  unsafe_allow_html=True)
-                        
-                        st.markdown("**Topics:**")
-                        for topic in article["topics"]:
-                            st.markdown(f"- {topic}")
-                        
-                        st.markdown(f"[Read Full Article]({article['link']})")
+                st.markdown("**Topics:**")
+                for topic in article["topics"]:
+                    st.markdown(f"- {topic}")
                 
-                # Generate and display Hindi TTS
-                st.header("🔊 Hindi Summary")
-                tts_response = requests.get(f"{BASE_URL}/tts/{company.strip()}")
-                if tts_response.status_code == 200:
-                    tts_data = tts_response.json()
-                    audio_file = tts_data.get("file")
-                    if audio_file:
-                        st.audio(audio_file, format="audio/mp3")
-                    else:
-                        st.warning("TTS file not available.")
-                else:
-                    st.error("Failed to generate Hindi summary.")
-                    
+                st.markdown(f"[Read Full Article]({article['link']})")
+        
+        # Generate and display Hindi TTS
+        st.header("🔊 Hindi Summary")
+        try:
+            audio = load_tts(selected)
+            if audio:
+                st.audio(audio, format="audio/mp3")
             else:
-                st.error("Error fetching news. Please try again with a different company name.")
-                
+                st.warning("TTS file not available.")
         except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
+            st.error(str(e))
 else:
     st.info("Enter a company name and click 'Analyze News' to start the analysis.")
-
-if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=7860)
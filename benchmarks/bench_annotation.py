@@ -0,0 +1,87 @@
+"""
+Count tokenizer and parser invocations for one company analysis.
+
+Articles from a recorded feed fixture go through pipeline.analyze_articles
+with every cache cleared. Each article must be parsed by spaCy exactly
+once, in one nlp.pipe call, and summaries and sentiment must not tokenize
+the text again (no NLTK sentence splitting, no TextBlob tokenizer).
+YAKE still segments its input itself, once per article.
+
+The CPU time of the tokenizer passes the shared annotation replaces is
+measured over the same texts for comparison.
+
+    python -m benchmarks.bench_annotation
+"""
+import os
+import time
+from collections import Counter
+from functools import wraps
+
+from benchmarks.stub_feed_server import load_fixture
+
+ARTICLES = 10
+
+
+def counting(counts, name, fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        counts[name] += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def main():
+    os.environ.setdefault("ANALYSIS_WORKERS", "0")
+    os.environ["SENTIMENT_CACHE_PATH"] = ""
+
+    import feedparser
+    import nltk
+    import yake
+    from textblob import TextBlob
+    from textblob.en import sentiment as pattern_sentiment
+    from utils import annotation, extract_topics, nlp_models, pipeline
+    from utils.scraper import entry_to_article
+
+    entries = feedparser.parse(load_fixture()).entries
+    articles = [a for a in map(entry_to_article, entries) if a is not None][:ARTICLES]
+
+    counts = Counter()
+    nltk.sent_tokenize = counting(counts, "nltk_sent_tokenize", nltk.sent_tokenize)
+    pattern_sentiment.tokenizer = counting(counts, "textblob_tokenizer", pattern_sentiment.tokenizer)
+    yake.KeywordExtractor.extract_keywords = counting(counts, "yake_extract",
+                                                      yake.KeywordExtractor.extract_keywords)
+
+    nlp_models.reset_parse_stats()
+    annotation.clear_annotation_cache()
+    extract_topics.clear_topic_cache()
+    start = time.process_time()
+    result = pipeline.analyze_articles([dict(a) for a in articles])
+    cpu = time.process_time() - start
+
+    counts.update({f"spacy_{name}": n for name, n in nlp_models.parse_stats.items()})
+    counts.update({f"annotations_{name}": n for name, n in annotation.annotation_stats.items()})
+    print(f"{len(articles)} articles analyzed in {cpu * 1000:.1f} ms CPU")
+    for name, n in sorted(counts.items()):
+        print(f"  {name:28s} {n}")
+
+    assert all(article.get("summary") for article in result["articles"])
+    assert counts["spacy_docs_parsed"] == len(articles) and counts["spacy_pipe_calls"] == 1
+    assert counts["annotations_built"] == len(articles)
+    assert counts["nltk_sent_tokenize"] == 0 and counts["textblob_tokenizer"] == 0
+    assert counts["yake_extract"] <= len(articles)
+
+    # The passes the annotation replaces: NLTK summaries and TextBlob's own tokenization
+    texts = [annotation.article_text(a)[0] for a in articles]
+    start = time.process_time()
+    try:
+        for article, text in zip(articles, texts):
+            nltk.sent_tokenize(article["content"])
+            TextBlob(text).sentiment
+    except LookupError:
+        print("replaced tokenizer passes: NLTK punkt data is not installed")
+        return
+    print(f"replaced tokenizer passes: {(time.process_time() - start) * 1000:.1f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
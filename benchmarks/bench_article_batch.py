@@ -0,0 +1,82 @@
+"""
+Memory and reduction cost of 10,000 articles as dicts vs an ArticleBatch.
+
+Articles are built from the stub feed generator with realistic field sizes,
+then held either as the usual list of dicts or as one ArticleBatch. Memory
+is the tracemalloc total of each representation; the sentiment summary is
+timed over already-scored articles, so only the reduction is measured.
+Both representations must produce the same summary and round-trip to the
+same JSON.
+
+    python -m benchmarks.bench_article_batch
+"""
+import random
+import time
+import tracemalloc
+
+from benchmarks.stub_feed_server import make_headline
+from utils.article_batch import ArticleBatch, CATEGORIES
+from utils.sentiment_analysis import compare_sentiment
+
+NUM_ARTICLES = 10_000
+SOURCES = ["Reuters", "Bloomberg", "Example Wire", "The Verge", "CNBC"]
+
+
+def make_articles(n, seed=0):
+    rng = random.Random(seed)
+    articles = []
+    for i in range(n):
+        headline = make_headline("Acme", i)
+        content = " ".join(make_headline("Acme", i * 7 + k) for k in range(4))
+        score = round(rng.uniform(-1, 1), 2)
+        articles.append({
+            "title": headline,
+            "link": f"https://example.com/acme/story-{i}",
+            "content": content,
+            "summary": content[:200],
+            "publish_date": f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:00:00",
+            "source": rng.choice(SOURCES),
+            "topics": headline.split()[1:4],
+            "sentiment": {"category": CATEGORIES[(score > 0.1) - (score < -0.1) + 1], "score": score},
+        })
+    return articles
+
+
+def traced(build):
+    tracemalloc.start()
+    try:
+        value = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, size
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    # Build each representation from JSON-shaped input under tracemalloc
+    articles, dict_bytes = traced(lambda: make_articles(NUM_ARTICLES))
+    batch, batch_bytes = traced(lambda: ArticleBatch.from_articles(make_articles(NUM_ARTICLES)))
+
+    dict_summary, dict_seconds = timed(lambda: compare_sentiment(articles))
+    batch_summary, batch_seconds = timed(lambda: batch.sentiment_summary())
+
+    print(f"{NUM_ARTICLES} articles")
+    print(f"list of dicts: {dict_bytes / 1e6:7.2f} MB, sentiment summary {dict_seconds * 1000:7.2f} ms")
+    print(f"ArticleBatch:  {batch_bytes / 1e6:7.2f} MB, sentiment summary {batch_seconds * 1000:7.2f} ms"
+          f" (columns {batch.nbytes / 1e6:.2f} MB)")
+    assert dict_summary == batch_summary, "both representations should give the same summary"
+    assert batch.to_articles() == articles, "the batch should round-trip to the same JSON"
+    assert batch_bytes < dict_bytes * 0.6, "the columnar batch should need far less memory"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Per-entry cost of text normalization over recorded Google News feed fixtures.
+
+Compares the original BeautifulSoup-for-everything `clean_text` with
+`utils.text_normalize` and asserts both produce identical output for every
+title, description and summary in the fixtures.
+
+    python -m benchmarks.bench_clean_text
+"""
+import glob
+import html
+import os
+import re
+import time
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from utils import text_normalize
+from utils.text_normalize import normalize_entries, normalize_text
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "*.xml")
+REPEAT = 20
+
+# Inputs that must take the BeautifulSoup fallback
+EDGE_CASES = [
+    "",
+    "Plain headline with no markup",
+    "AT&amp;T &amp;amp; Verizon &lt;b&gt;bold&lt;/b&gt;",
+    "Procter & Gamble <b>R&D</b> &amp;copy &#38;#233;",
+    "<p>Comment <!-- hidden --> kept</p>",
+    "<script>var x = 1;</script>Script text",
+    "Stray < sign and <a href='x>y'>quoted gt</a>",
+    "<A HREF=\"x\">Upper case</A>&nbsp;<FONT color=#6f6f6f>Source</FONT>",
+    "<img src=x>Image then text<br/>next",
+]
+
+
+def legacy_clean_text(text):
+    """The original scraper.clean_text, kept as the reference output."""
+    if not text:
+        return ""
+    text = html.unescape(text)
+    text = BeautifulSoup(text, "html.parser").get_text()
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    return text
+
+
+def load_entries():
+    entries = []
+    for path in sorted(glob.glob(FIXTURES)):
+        with open(path, "rb") as f:
+            entries.extend(feedparser.parse(f.read()).entries)
+    return entries
+
+
+def fields(entries):
+    for entry in entries:
+        for field in ("title", "description", "summary"):
+            yield entry.get(field, "")
+
+
+def main():
+    entries = load_entries()
+    values = list(fields(entries)) + EDGE_CASES
+
+    mismatches = [v for v in values if normalize_text(v) != legacy_clean_text(v)]
+    assert not mismatches, f"normalize_text differs from clean_text for: {mismatches[:3]}"
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for value in fields(entries):
+            legacy_clean_text(value)
+    legacy = (time.perf_counter() - start) / (REPEAT * len(entries))
+
+    for key in text_normalize.stats:
+        text_normalize.stats[key] = 0
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        normalize_entries(entries)
+    batched = (time.perf_counter() - start) / (REPEAT * len(entries))
+
+    print(f"{len(entries)} entries, {len(values)} values checked, outputs identical")
+    print(f"legacy clean_text:  {legacy * 1e6:8.1f} us/entry")
+    print(f"normalize_entries:  {batched * 1e6:8.1f} us/entry ({legacy / batched:.1f}x)")
+    print(f"paths taken: {text_normalize.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure the cost of the stage timers.
+
+Times a tight loop of `metrics.stage` blocks around a trivial body with
+instrumentation disabled and enabled, against the bare loop. Disabled
+timers should cost well under a microsecond per stage, which is noise next
+to any real stage (a feed request, a spaCy parse).
+
+    python -m benchmarks.bench_metrics_overhead
+"""
+import time
+
+from utils import metrics
+
+ITERATIONS = 200_000
+
+
+def bare():
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        pass
+    return time.perf_counter() - start
+
+
+def staged():
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        with metrics.stage("bench"):
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    enabled = metrics.METRICS_ENABLED
+    try:
+        baseline = bare()
+        metrics.METRICS_ENABLED = False
+        disabled = staged()
+        metrics.METRICS_ENABLED = True
+        token = metrics.start_request()
+        active = staged()
+        metrics.end_request(token)
+    finally:
+        metrics.METRICS_ENABLED = enabled
+        metrics.reset()
+
+    def per_call(seconds):
+        return (seconds - baseline) / ITERATIONS * 1e9
+
+    print(f"disabled: {per_call(disabled):7.0f} ns per stage")
+    print(f"enabled:  {per_call(active):7.0f} ns per stage")
+    assert per_call(disabled) < 1000, "disabled timers should be close to free"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure request latency for watchlisted companies kept warm by the prefetcher.
+
+Feeds come from the local stub with a fixed delay per query. A watchlist is
+refreshed in the background with a short interval; the first refreshes must
+be staggered across the interval instead of fired together. Afterwards a
+watchlisted company is served from the analysis cache while a company off
+the watchlist pays for the full fetch and analysis.
+
+    python -m benchmarks.bench_prefetch
+"""
+import os
+import time
+
+from benchmarks.stub_feed_server import StubFeedServer
+
+WATCHLIST = ["Acme", "Globex", "Initech"]
+COLD = "Umbrella"
+FEED_DELAY = 0.3
+INTERVAL = 1.5
+# Seconds to wait for the first refreshes before giving up
+REFRESH_TIMEOUT = 30.0
+
+
+def main():
+    with StubFeedServer(num_items=5) as server:
+        # Configure before the app modules are imported: offline and nothing persisted
+        os.environ["NEWS_RSS_URL"] = server.url
+        os.environ.setdefault("ANALYSIS_WORKERS", "0")
+        os.environ["SENTIMENT_CACHE_PATH"] = ""
+        os.environ["ARTICLE_STORE_PATH"] = ""
+
+        from utils import pipeline
+        from utils.prefetch import PrefetchScheduler
+        from utils.scraper import build_queries
+
+        for company in WATCHLIST + [COLD]:
+            for query in build_queries(company):
+                server.delays[query["params"]["q"]] = FEED_DELAY
+
+        started = {}
+
+        def refresh(company):
+            started[company] = time.monotonic()
+            return pipeline.refresh_company(company)
+
+        scheduler = PrefetchScheduler(WATCHLIST, refresh, key=pipeline.company_key,
+                                      interval=INTERVAL, jitter=0.1, concurrency=len(WATCHLIST))
+        begin = time.monotonic()
+        scheduler.start()
+        try:
+            while len(started) < len(WATCHLIST) or any(s["refreshed_at"] is None for s in scheduler.status().values()):
+                errors = {company: s["error"] for company, s in scheduler.status().items() if s["error"]}
+                if errors:
+                    raise SystemExit(f"prefetch failed: {errors}")
+                if time.monotonic() - begin > REFRESH_TIMEOUT:
+                    raise SystemExit(f"first refreshes did not finish within {REFRESH_TIMEOUT}s")
+                time.sleep(0.05)
+        finally:
+            scheduler.stop()
+
+        offsets = [round(started[company] - begin, 2) for company in WATCHLIST]
+        print(f"first refreshes started at {offsets} s (interval {INTERVAL}s)")
+
+        start = time.perf_counter()
+        warm = pipeline.get_company_analysis(WATCHLIST[0])
+        warm_latency = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cold = pipeline.get_company_analysis(COLD)
+        cold_latency = time.perf_counter() - start
+
+    print(f"watchlisted: {warm_latency * 1000:.2f} ms")
+    print(f"cold:        {cold_latency * 1000:.2f} ms")
+    assert warm["articles"] and cold["articles"]
+    gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+    assert all(gap > INTERVAL / len(WATCHLIST) / 2 for gap in gaps), "first refreshes should be staggered"
+    assert warm_latency < cold_latency / 10, "a watchlisted company should be a cache read"
+
+
+if __name__ == "__main__":
+    main()
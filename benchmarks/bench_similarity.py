@@ -0,0 +1,39 @@
+"""
+Time all-pairs article similarity as the corpus grows.
+
+Synthetic articles draw key points from a shared vocabulary, so pairs have
+a realistic mix of overlap. The whole N x N matrix and the top-k pair
+selection should stay in the millisecond range for hundreds of articles.
+
+    python -m benchmarks.bench_similarity
+"""
+import random
+import time
+
+from benchmarks.stub_feed_server import WORDS
+from utils.similarity import rank_pairs
+
+SIZES = [10, 100, 500, 1000]
+TERMS_PER_ARTICLE = 10
+
+
+def make_terms(n, seed=0):
+    rng = random.Random(seed)
+    phrases = [f"{a} {b}" for a in WORDS for b in WORDS if a != b]
+    return [rng.sample(phrases, TERMS_PER_ARTICLE) for _ in range(n)]
+
+
+def main():
+    for n in SIZES:
+        terms = make_terms(n)
+        start = time.perf_counter()
+        pairs = rank_pairs(terms, k=5)
+        elapsed = time.perf_counter() - start
+        print(f"{n:5d} articles, {n * (n - 1) // 2:7d} pairs: {elapsed * 1000:7.1f} ms")
+        assert rank_pairs(terms, k=5) == pairs, "pair selection should be deterministic"
+        if n == 500:
+            assert elapsed < 0.5, "hundreds of articles should take milliseconds, not seconds"
+
+
+if __name__ == "__main__":
+    main()
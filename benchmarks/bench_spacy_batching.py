@@ -0,0 +1,79 @@
+"""
+Compare per-article spaCy parsing with the batched, memoized path.
+
+"before" replays the old call pattern: one nlp() call per article for topic
+extraction plus two per compared pair for key points. "after" runs
+compare_articles and generate_comparative_analysis, which share one
+nlp.pipe pass per request.
+
+    python -m benchmarks.bench_spacy_batching
+"""
+import time
+from itertools import combinations
+
+from benchmarks.stub_feed_server import make_headline
+from utils.comparative_analysis import generate_comparative_analysis
+from utils.annotation import clear_annotation_cache
+from utils.nlp_models import get_nlp, parse_stats, reset_parse_stats
+from utils.scraper import compare_articles
+
+SIZES = [10, 100, 500]
+
+
+def make_articles(n):
+    articles = []
+    for i in range(n):
+        headline = make_headline("Acme", i)
+        articles.append({
+            "title": headline,
+            "content": f"{headline}. Acme Corp said on Monday that {make_headline('Acme Corp', i)}.",
+            "link": f"https://example.com/story-{i}",
+            "source": "Example Wire",
+        })
+    return articles
+
+
+def run_before(articles):
+    nlp = get_nlp()
+    calls = 0
+    texts = [f"{a['title']} {a['content']}" for a in articles]
+    for text in texts:
+        nlp(text)
+        calls += 1
+    for i, (a, b) in enumerate(combinations(range(len(texts)), 2)):
+        if i >= 5:
+            break
+        nlp(texts[a])
+        nlp(texts[b])
+        calls += 2
+    return calls
+
+
+def run_after(articles):
+    clear_annotation_cache()
+    reset_parse_stats()
+    compare_articles(articles)
+    generate_comparative_analysis(articles)
+    return parse_stats["docs_parsed"], parse_stats["pipe_calls"]
+
+
+def main():
+    get_nlp()  # Load the model outside the timed region
+    print(f"{'articles':>8} | {'before calls':>12} {'time':>8} | {'after docs':>10} {'pipe calls':>10} {'time':>8}")
+    for n in SIZES:
+        articles = make_articles(n)
+
+        start = time.perf_counter()
+        before_calls = run_before(articles)
+        before_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        docs_parsed, pipe_calls = run_after(articles)
+        after_time = time.perf_counter() - start
+
+        print(f"{n:>8} | {before_calls:>12} {before_time:>7.2f}s | {docs_parsed:>10} {pipe_calls:>10} {after_time:>7.2f}s")
+        assert docs_parsed == n, "each article should be parsed exactly once"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure import time and resident memory of the application modules.
+
+Each measurement runs in a fresh interpreter so nothing is shared between
+them. Run it on two checkouts to compare startup cost before and after a
+change.
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import subprocess
+import sys
+
+MODULES = ["utils", "utils.scraper", "utils.comparative_analysis", "api"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+import_seconds = time.perf_counter() - start
+import_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+from utils.scraper import extract_topics
+from utils.comparative_analysis import extract_key_points
+extract_topics("Microsoft announced a new AI partnership with OpenAI in Seattle.")
+extract_key_points("Microsoft announced a new AI partnership with OpenAI in Seattle.")
+first_use_seconds = time.perf_counter() - start
+print(json.dumps({
+    "module": sys.argv[1],
+    "import_seconds": round(import_seconds, 3),
+    "import_rss_mb": round(import_rss / 1024, 1),
+    "first_use_seconds": round(first_use_seconds, 3),
+    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+}))
+"""
+
+
+def measure(module):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, module],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    for module in MODULES:
+        result = measure(module)
+        print(
+            f"{result['module']:<28} import {result['import_seconds']:>6.2f}s "
+            f"{result['import_rss_mb']:>7.1f} MB | first use {result['first_use_seconds']:>6.2f}s "
+            f"peak {result['peak_rss_mb']:>7.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure time-to-first-article of the streaming analysis.
+
+Query variants are served by the local stub with increasing delays. The
+buffered pipeline can only respond after every article has been fetched
+and analyzed; the streaming pipeline emits the first article as soon as
+the fastest feed returns and it has been annotated. Both runs must end
+with the same analysis.
+
+    python -m benchmarks.bench_stream_ttfa
+"""
+import time
+
+from benchmarks.stub_feed_server import StubFeedServer
+from utils import pipeline
+from utils.scraper import build_queries, fetch_news
+
+COMPANY = "Acme"
+DELAYS = [0.2, 0.6, 1.0, 1.4]
+
+
+def run_buffered(server):
+    start = time.perf_counter()
+    result = fetch_news(COMPANY, base_url=server.url, use_cache=False, analyze=False)
+    result = pipeline.analyze_articles(result["articles"])
+    return time.perf_counter() - start, result
+
+
+def run_streaming(server):
+    start = time.perf_counter()
+    first = None
+    result = {"articles": []}
+    for event, data in pipeline.iter_company_events(COMPANY, base_url=server.url):
+        if event == "article":
+            if first is None:
+                first = time.perf_counter() - start
+            result["articles"].append(data)
+        elif event != "done":
+            result[event] = data
+    return first, time.perf_counter() - start, result
+
+
+def main():
+    queries = build_queries(COMPANY)
+    delays = {query["params"]["q"]: delay for query, delay in zip(queries, DELAYS)}
+
+    # Few items per feed, so every query variant is needed
+    with StubFeedServer(delays=delays, num_items=3) as server:
+        buffered, expected = run_buffered(server)
+        pipeline.analysis_cache.invalidate(pipeline.company_key(COMPANY))
+        ttfa, total, streamed = run_streaming(server)
+
+    print(f"buffered:  first article after {buffered:.2f}s")
+    print(f"streaming: first article after {ttfa:.2f}s, complete after {total:.2f}s")
+    assert streamed == expected, "streaming should produce the same analysis"
+    assert ttfa < buffered / 2, "the first article should arrive long before the full analysis"
+
+
+if __name__ == "__main__":
+    main()
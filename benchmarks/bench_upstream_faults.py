@@ -0,0 +1,78 @@
+"""
+Check fetching against an unhealthy feed host.
+
+Local stub servers inject errors and latency:
+- a host that starts answering 503 must be served from the (stale) feed
+  cache within the request budget, and its circuit breaker must then fail
+  fast without contacting the host, until a probe after the cooldown
+  finds it healthy again;
+- a host slower than the budget must cost no more than the budget,
+  instead of the fixed 10 s timeout per query and retry.
+
+    python -m benchmarks.bench_upstream_faults
+"""
+import os
+import time
+
+from benchmarks.stub_feed_server import StubFeedServer
+
+BUDGET = 2.0
+COOLDOWN = 1.0
+WARM_COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark"]
+
+
+def timed_fetch(fetch_news, company, server, budget=BUDGET):
+    from utils.upstream import Deadline
+
+    start = time.perf_counter()
+    result = fetch_news(company, base_url=server.url, analyze=False, deadline=Deadline(budget))
+    return time.perf_counter() - start, result
+
+
+def main():
+    # Configure before the app modules are imported
+    os.environ["BREAKER_COOLDOWN"] = str(COOLDOWN)
+    os.environ["ARTICLE_STORE_PATH"] = ""
+    os.environ.pop("FEED_CACHE_PATH", None)
+
+    from utils.feed_cache import feed_cache
+    from utils.scraper import fetch_news
+    from utils.upstream import host_health
+
+    with StubFeedServer(num_items=5) as server:
+        health = host_health(server.url)
+        for company in WARM_COMPANIES:
+            fetch_news(company, base_url=server.url, analyze=False)
+        print(f"healthy host: adaptive timeout {health.timeout():.2f}s after {len(health.latencies)} responses")
+
+        # Upstream fails; every cached feed is now stale
+        server.error_status = 503
+        feed_cache.ttl = 0
+        elapsed, result = timed_fetch(fetch_news, "Acme", server)
+        print(f"failing host: {len(result.get('articles', []))} stale articles in {elapsed:.2f}s, "
+              f"circuit {health.state}")
+        assert result.get("articles"), "stale cached feeds should be served"
+        assert elapsed < BUDGET, "the budget should bound the retries"
+        assert health.state == "open"
+
+        sent = len(server.requests)
+        elapsed, result = timed_fetch(fetch_news, "Globex", server)
+        print(f"open circuit: {len(result.get('articles', []))} stale articles in {elapsed * 1000:.1f} ms, "
+              f"{len(server.requests) - sent} requests sent")
+        assert result.get("articles") and len(server.requests) == sent
+
+        # Upstream recovers; the first request after the cooldown probes it
+        server.error_status = None
+        time.sleep(COOLDOWN)
+        elapsed, result = timed_fetch(fetch_news, "Initech", server)
+        print(f"recovered host: {len(result.get('articles', []))} articles in {elapsed:.2f}s, circuit {health.state}")
+        assert result.get("articles") and health.state == "closed"
+
+    with StubFeedServer(num_items=5, delay=3 * BUDGET) as slow:
+        elapsed, result = timed_fetch(fetch_news, "Acme", slow)
+        print(f"slow host: gave up after {elapsed:.2f}s ({result.get('error', 'articles returned')})")
+        assert "error" in result and elapsed < BUDGET * 1.5
+
+
+if __name__ == "__main__":
+    main()
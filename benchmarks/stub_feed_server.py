@@ -0,0 +1,137 @@
+"""
+Local stand-in for the Google News RSS endpoint used by the benchmarks.
+
+Feeds are generated from the request's `q` parameter, so every query variant
+that `fetch_news` builds gets its own set of items. A recorded fixture can be
+served instead of generated feeds. Per-query latency can be injected to
+simulate slow upstream feeds. Feeds carry an ETag and conditional requests
+for an unchanged feed are answered with 304.
+"""
+import hashlib
+import os
+import random
+import threading
+import time
+from email.utils import formatdate
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+WORDS = (
+    "shares rally slump quarterly earnings revenue guidance analysts investors "
+    "launch product partnership acquisition merger lawsuit regulator chips cloud "
+    "software factory expansion layoffs hiring record profit loss outlook market "
+    "security breach deal contract supply chain battery model pricing forecast"
+).split()
+
+
+def make_headline(query, i):
+    """Deterministic, distinct headline for item i of a query's feed."""
+    rng = random.Random(f"{query}:{i}")
+    return f"{query} {' '.join(rng.sample(WORDS, 8))}"
+
+
+def load_fixture(name="google_news_microsoft.xml"):
+    """Bytes of a recorded feed from benchmarks/fixtures."""
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return f.read()
+
+
+def make_feed(query, num_items=10, start=0):
+    """Build a Google News style RSS document for a query."""
+    items = []
+    for i in range(start, start + num_items):
+        link = f"https://example.com/{query.replace(' ', '-')}/story-{i}"
+        headline = make_headline(query, i)
+        description = (
+            f'<a href="{link}" target="_blank">{headline}</a>'
+            f'&nbsp;&nbsp;<font color="#6f6f6f">Example Wire</font>'
+        )
+        items.append(
+            "<item>"
+            f"<title>{escape(headline)} - Example Wire</title>"
+            f"<link>{link}</link>"
+            f"<pubDate>{formatdate(1700000000 + i * 60, usegmt=True)}</pubDate>"
+            f"<description>{escape(description)}</description>"
+            f'<source url="https://example.com">Example Wire</source>'
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel>'
+        f"<title>{escape(query)} - Google News</title>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+class StubFeedServer:
+    """
+    Threaded HTTP server serving generated feeds.
+
+    :param delays: Mapping of query string to response delay in seconds.
+    :param num_items: Number of items in each generated feed.
+    :param fixture: Recorded feed bytes served for every query instead of
+        generated feeds.
+    :param delay: Response delay in seconds for queries not in `delays`.
+    :param error_status: When set, every request is answered with this
+        HTTP status and no feed (e.g. 503 to simulate an unhealthy upstream).
+    """
+
+    def __init__(self, delays=None, num_items=10, fixture=None, delay=0.0, error_status=None):
+        self.delays = dict(delays or {})
+        self.delay = delay
+        self.error_status = error_status
+        self.num_items = num_items
+        self.fixture = fixture
+        self.requests = []
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query).get("q", [""])[0]
+                server.requests.append(query)
+                time.sleep(server.delays.get(query, server.delay))
+                if server.error_status is not None:
+                    self.send_response(server.error_status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.fixture if server.fixture is not None else make_feed(query, server.num_items)
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/rss/search"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
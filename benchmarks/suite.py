@@ -0,0 +1,278 @@
+"""
+Offline benchmark suite: per-stage and end-to-end throughput, latency and
+peak memory, with machine-readable output and regression checks.
+
+Every feed comes from the local stub server, either generated at 10, 100,
+1,000 and 10,000 items or replayed from a recorded fixture, so no network
+access is needed. Each stage runs `--repeat` times for latency and once more
+under tracemalloc for peak Python memory. The end-to-end case calls
+`GET /fetch-news/{company}` (api.get_news) in-process with every cache
+cleared before each request.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --threshold 0.2
+
+With --baseline, any case whose median latency grew by more than the
+threshold (a fraction, 0.2 = 20%) is reported and the exit status is 1.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.stub_feed_server import StubFeedServer, load_fixture, make_feed
+
+SIZES = [10, 100, 1000, 10000]
+# NLP stages run on at most this many articles per feed size
+NLP_ITEM_LIMIT = 1000
+COMPANY = "Acme"
+STREAM_CHUNK_SIZE = 4096
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure(fn, items, repeat):
+    """Time fn() `repeat` times, then run it once more under tracemalloc for peak memory."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50 = statistics.median(durations)
+    return {
+        "items": items,
+        "runs": repeat,
+        "p50_s": round(p50, 6),
+        "p95_s": round(percentile(durations, 95), 6),
+        "throughput_per_s": round(items / p50, 1) if p50 else None,
+        "peak_mem_bytes": peak,
+    }
+
+
+def run_case(results, name, fn, items, repeat):
+    from utils.nlp_models import ModelNotInstalledError
+
+    try:
+        result = measure(fn, items, repeat)
+    except ModelNotInstalledError as e:
+        result = {"skipped": str(e)}
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    results[name] = result
+    print(format_row(name, result), file=sys.stderr)
+
+
+def stage_cases(feed):
+    """(name, fn, items) for every pipeline stage over one feed document."""
+    import feedparser
+    from utils import sentiment_analysis
+    from utils.comparative_analysis import generate_comparative_analysis
+    from utils.dedup import Deduplicator
+    from utils.extract_topics import clear_topic_cache, extract_topics
+    from utils.annotation import annotate_articles, clear_annotation_cache
+    from utils.rss_stream import iter_rss_entries
+    from utils.scraper import compare_articles, entry_to_article
+    from utils.sentiment_cache import SentimentCache
+    from utils.similarity import rank_pairs
+    from utils.text_normalize import normalize_entries
+
+    entries = feedparser.parse(feed).entries
+    articles = [a for a in (entry_to_article(e) for e in entries) if a is not None]
+    subset = articles[:NLP_ITEM_LIMIT]
+    topics = [extract_topics(a["content"]) for a in subset]
+
+    def chunks():
+        return (feed[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(feed), STREAM_CHUNK_SIZE))
+
+    def dedup():
+        d = Deduplicator()
+        for article in articles:
+            d.add(article)
+
+    def annotation():
+        clear_annotation_cache()
+        annotate_articles([dict(a) for a in subset])
+
+    def yake():
+        clear_topic_cache()
+        for article in subset:
+            extract_topics(article["content"])
+
+    def sentiment():
+        # A fresh in-memory cache, so every article is scored (from the
+        # annotations left by the annotation stage)
+        sentiment_analysis.sentiment_cache = SentimentCache(path=None)
+        sentiment_analysis.compare_sentiment([dict(a) for a in subset])
+
+    def spacy_topics():
+        clear_annotation_cache()
+        compare_articles(subset)
+
+    def comparative():
+        clear_annotation_cache()
+        generate_comparative_analysis([dict(a, topics=t) for a, t in zip(subset, topics)])
+
+    return [
+        ("feedparser", lambda: feedparser.parse(feed), len(entries)),
+        ("rss_stream", lambda: list(iter_rss_entries(chunks())), len(entries)),
+        ("clean_text", lambda: normalize_entries(entries), len(entries)),
+        ("dedup", dedup, len(articles)),
+        ("annotation", annotation, len(subset)),
+        ("yake_topics", yake, len(subset)),
+        ("textblob_sentiment", sentiment, len(subset)),
+        ("spacy_topics", spacy_topics, len(subset)),
+        ("comparative_analysis", comparative, len(subset)),
+        ("similarity", lambda: rank_pairs(topics), len(subset)),
+    ]
+
+
+def end_to_end_case(client, server, size):
+    """(fn, items) calling GET /fetch-news/{company} with cold caches."""
+    from utils import sentiment_analysis
+    from utils.extract_topics import clear_topic_cache
+    from utils.feed_cache import feed_cache
+    from utils.annotation import clear_annotation_cache
+    from utils.pipeline import analysis_cache, company_key
+    from utils.sentiment_cache import SentimentCache
+
+    server.num_items = size
+    returned = []
+
+    def request():
+        analysis_cache.invalidate(company_key(COMPANY))
+        feed_cache.clear()
+        clear_annotation_cache()
+        clear_topic_cache()
+        sentiment_analysis.sentiment_cache = SentimentCache(path=None)
+        response = client.get(f"/fetch-news/{COMPANY}")
+        response.raise_for_status()
+        returned.append(len(response.json()["articles"]))
+
+    request()
+    return request, returned[0]
+
+
+def format_row(name, result):
+    if "p50_s" not in result:
+        return f"{name:36s} {result.get('skipped') or result.get('error')}"
+    return (
+        f"{name:36s} p50 {result['p50_s'] * 1000:10.2f} ms  p95 {result['p95_s'] * 1000:10.2f} ms  "
+        f"{result['throughput_per_s'] or 0:12.1f} items/s  peak {result['peak_mem_bytes'] / 1e6:8.2f} MB"
+    )
+
+
+def compare(results, baseline, threshold):
+    """Cases whose median latency grew by more than `threshold` relative to the baseline."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name, {})
+        if "p50_s" in result and before.get("p50_s"):
+            change = result["p50_s"] / before["p50_s"] - 1
+            if change > threshold:
+                regressions.append({"case": name, "baseline_s": before["p50_s"],
+                                    "current_s": result["p50_s"], "change": round(change, 3)})
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma-separated items per generated feed")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--fixture", default="google_news_microsoft.xml",
+                        help="recorded feed in benchmarks/fixtures, also benchmarked ('' to skip)")
+    parser.add_argument("--skip-end-to-end", action="store_true", help="only benchmark the stages")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed median latency growth over the baseline (default 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    with StubFeedServer(num_items=sizes[0]) as server:
+        # Configure before the app modules are imported: offline, quiet, nothing persisted
+        os.environ["NEWS_RSS_URL"] = server.url
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        os.environ.setdefault("ANALYSIS_WORKERS", "0")
+        os.environ["SENTIMENT_CACHE_PATH"] = ""
+        os.environ["ARTICLE_STORE_PATH"] = ""
+        os.environ.pop("FEED_CACHE_PATH", None)
+
+        feeds = [(f"generated_{size}", make_feed(COMPANY, size)) for size in sizes]
+        if args.fixture:
+            feeds.append((f"fixture_{os.path.splitext(args.fixture)[0]}", load_fixture(args.fixture)))
+
+        results = {}
+        for label, feed in feeds:
+            for stage, fn, items in stage_cases(feed):
+                run_case(results, f"{stage}@{label}", fn, items, args.repeat)
+
+        if not args.skip_end_to_end:
+            from fastapi.testclient import TestClient
+            import api
+
+            with TestClient(api.app) as client:
+                for size in sizes:
+                    try:
+                        fn, items = end_to_end_case(client, server, size)
+                    except Exception as e:
+                        results[f"get_news@generated_{size}"] = {"error": f"{type(e).__name__}: {e}"}
+                        print(format_row(f"get_news@generated_{size}", results[f"get_news@generated_{size}"]),
+                              file=sys.stderr)
+                        continue
+                    run_case(results, f"get_news@generated_{size}", fn, items, args.repeat)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "nlp_item_limit": NLP_ITEM_LIMIT,
+        },
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(results, baseline, args.threshold)
+        report["threshold"] = args.threshold
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['case']}: {regression['baseline_s'] * 1000:.2f} ms -> "
+                  f"{regression['current_s'] * 1000:.2f} ms ({regression['change']:+.0%})", file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Shared fixtures. Tests run offline: feeds come from the benchmark stub
+server, spaCy runs a blank English pipeline with a small stand-in tagger
+(en_core_web_sm need not be installed), and nothing is persisted.
+"""
+import os
+
+# Configure before the app modules are imported
+os.environ["ARTICLE_STORE_PATH"] = ""
+os.environ["SENTIMENT_CACHE_PATH"] = ""
+os.environ["ANALYSIS_WORKERS"] = "0"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.pop("FEED_CACHE_PATH", None)
+
+import pytest
+import spacy
+from spacy.language import Language
+from spacy.tokens import Span
+
+from benchmarks.stub_feed_server import StubFeedServer
+
+
+@Language.component("stand_in_tagger")
+def stand_in_tagger(doc):
+    """Capitalized words become PROPN tokens and ORG entities, long words NOUNs."""
+    entities = []
+    for token in doc:
+        if token.is_alpha and token.text[0].isupper():
+            token.pos_ = "PROPN"
+            entities.append(Span(doc, token.i, token.i + 1, label="ORG"))
+        else:
+            token.pos_ = "NOUN" if token.is_alpha and len(token) > 4 else "X"
+        token.dep_ = "ROOT"
+        token.head = token
+    doc.ents = entities
+    return doc
+
+
+@pytest.fixture(autouse=True)
+def nlp():
+    """The stand-in pipeline, registered as the shared default model."""
+    from utils import nlp_models
+
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer", name="parser")
+    pipeline.add_pipe("stand_in_tagger", name="tagger")
+    nlp_models._models[nlp_models.DEFAULT_MODEL] = pipeline
+    yield pipeline
+    nlp_models._models.pop(nlp_models.DEFAULT_MODEL, None)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from utils.annotation import clear_annotation_cache
+    from utils.feed_cache import feed_cache
+    from utils.nlp_models import reset_parse_stats
+
+    feed_cache.clear()
+    clear_annotation_cache()
+    reset_parse_stats()
+
+
+@pytest.fixture
+def feed_server():
+    with StubFeedServer(num_items=5) as server:
+        yield server
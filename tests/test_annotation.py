@@ -0,0 +1,85 @@
+from benchmarks.stub_feed_server import make_headline
+from utils import pipeline
+from utils.annotation import annotate_articles, annotate_texts, annotation_stats, clear_annotation_cache
+from utils.nlp_models import parse_stats
+
+
+def make_articles(n, company="Acme"):
+    articles = []
+    for i in range(n):
+        headline = make_headline(company, i)
+        articles.append({
+            "title": headline,
+            "content": f"{headline}. {company} Corp said on Monday that quarterly profits rose. "
+                       f"Analysts expected weaker numbers from the company.",
+            "link": f"https://example.com/{company.lower()}-{i}",
+            "source": "Example Wire",
+        })
+    return articles
+
+
+def test_each_text_is_parsed_once_and_then_reused():
+    first = annotate_texts(["Acme Corp grew.", "Globex shrank.", "Acme Corp grew."])
+    again = annotate_texts(["Acme  Corp\ngrew."])
+
+    assert first[0] is first[2] is again[0]
+    assert parse_stats == {"pipe_calls": 1, "docs_parsed": 2}
+    assert annotation_stats["built"] == 2
+
+
+def test_reused_annotations_keep_each_callers_content_start():
+    text = "Acme grew. Profits rose."
+    whole, = annotate_texts([text])
+    content, = annotate_texts([text], [len("Acme grew. ")])
+    spaced, = annotate_texts(["Acme  grew.\n Profits rose."], [len("Acme  grew.\n ")])
+
+    assert parse_stats["docs_parsed"] == 1
+    assert whole.content == text
+    assert content.content == spaced.content == "Profits rose."
+    assert content.content_sentences() == ["Profits rose."]
+
+
+def test_annotation_gives_articles_a_summary_from_their_content():
+    article = {"title": "Acme beats estimates",
+               "content": "Acme Corp said profits rose. Shares climbed. Analysts agreed. Rivals struggled."}
+    annotation, = annotate_articles([article])
+
+    assert article["summary"] == "Acme Corp said profits rose. Shares climbed. Analysts agreed."
+    assert ("Acme", "ORG") in annotation.entities
+
+
+def test_every_analysis_stage_reads_one_shared_annotation():
+    articles = make_articles(6)
+
+    result = pipeline.analyze_articles(articles)
+
+    assert parse_stats == {"pipe_calls": 1, "docs_parsed": len(articles)}
+    assert annotation_stats["built"] == len(articles)
+    assert annotation_stats["reused"] > 0
+    assert all(a["summary"] and "topics" in a and a["sentiment"] for a in result["articles"])
+
+
+def test_articles_with_stored_derived_fields_are_not_parsed_again():
+    first = pipeline.analyze_articles(make_articles(4))
+    # As read back from the article store: derived fields, no annotations in memory
+    clear_annotation_cache()
+    parsed = parse_stats["docs_parsed"]
+
+    again = pipeline.analyze_articles([dict(a) for a in first["articles"]])
+
+    assert again == first
+    assert parse_stats["docs_parsed"] == parsed
+
+
+def test_articles_shared_between_companies_are_annotated_once():
+    shared = make_articles(3, "Shared")
+    company_articles = {
+        "Acme": make_articles(2) + shared,
+        "Globex": make_articles(2, "Globex") + shared,
+    }
+
+    results = pipeline.analyze_article_sets(company_articles)
+
+    assert set(results) == {"Acme", "Globex"}
+    assert parse_stats["docs_parsed"] == 7
+    assert annotation_stats["built"] == 7
@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+from functools import partial
+
+import httpx
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+import api
+from benchmarks.stub_feed_server import StubFeedServer
+from utils.execution import ConcurrencyLimiter
+from utils.pipeline import analysis_cache, analyze_articles, company_key, iter_company_events
+from utils.scraper import build_queries
+
+COMPANY = "Acme"
+# The first query variant answers quickly, the others only after SLOW_DELAY
+FAST_DELAY = 0.1
+SLOW_DELAY = 1.0
+
+
+@pytest.fixture
+def client(feed_server, monkeypatch):
+    """API client (without the startup warm-up) whose feeds come from the stub server."""
+    monkeypatch.setattr(api, "iter_company_events", partial(iter_company_events, base_url=feed_server.url))
+    analysis_cache.invalidate(company_key(COMPANY))
+    yield TestClient(api.app)
+    analysis_cache.invalidate(company_key(COMPANY))
+
+
+@pytest.fixture
+def live_api():
+    """
+    The API served by uvicorn on a free port (without the startup warm-up).
+    TestClient runs the whole app before returning a response, so timing
+    streamed events needs a real server.
+    """
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=0, lifespan="off",
+                                           log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    host, port = server.servers[0].sockets[0].getsockname()[:2]
+    analysis_cache.invalidate(company_key(COMPANY))
+    yield f"http://{host}:{port}"
+    analysis_cache.invalidate(company_key(COMPANY))
+    server.should_exit = True
+    thread.join()
+
+
+def test_first_article_arrives_before_the_slow_feeds_answer(live_api, monkeypatch):
+    # Load the NLP stages (YAKE, TextBlob) before anything is timed
+    analyze_articles([{"title": "Warm-up", "content": "Acme Corp said profits rose.", "link": "https://example.com/"}])
+    delays = {query["params"]["q"]: SLOW_DELAY for query in build_queries(COMPANY)}
+    delays[build_queries(COMPANY)[0]["params"]["q"]] = FAST_DELAY
+    # Few items per feed, so the analysis needs every query variant
+    with StubFeedServer(delays=delays, num_items=3) as feeds:
+        monkeypatch.setattr(api, "iter_company_events", partial(iter_company_events, base_url=feeds.url))
+        start = time.perf_counter()
+        arrivals = []
+        with httpx.stream("GET", f"{live_api}/fetch-news/{COMPANY}/stream", timeout=10) as response:
+            for line in response.iter_lines():
+                arrivals.append((json.loads(line)["event"], time.perf_counter() - start))
+
+    first_article = next(elapsed for event, elapsed in arrivals if event == "article")
+    last_event, done = arrivals[-1]
+    assert last_event == "done" and done >= SLOW_DELAY
+    # A response buffered until the analysis is complete could not start before the slow feeds
+    assert first_article < SLOW_DELAY / 2
+
+
+def test_limiter_rejects_beyond_its_limit():
+    limiter = ConcurrencyLimiter(limit=2)
+
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.rejected == 1
+
+    release = limiter.releaser()
+    release()
+    release()
+    assert limiter.active == 1
+
+
+def test_ndjson_stream_sends_articles_then_sections(client):
+    response = client.get(f"/fetch-news/{COMPANY}/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line)["event"] for line in response.text.splitlines()]
+    articles = events.count("article")
+    assert articles and events[:articles] == ["article"] * articles
+    assert events[articles:] == ["analysis", "sentiment_analysis", "comparative_analysis", "done"]
+    assert api.request_limiter.active == 0
+
+
+def test_sse_stream_replays_the_cached_analysis(client):
+    client.get(f"/fetch-news/{COMPANY}/stream")
+    response = client.get(f"/fetch-news/{COMPANY}/stream", params={"format": "sse"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = response.text.strip().split("\n\n")
+    assert messages[-1].startswith("event: done\n")
+    assert json.loads(messages[-1].split("data: ", 1)[1])["cached"] is True
+
+
+def test_stream_closed_early_releases_its_slot(client):
+    with client.stream("GET", f"/fetch-news/{COMPANY}/stream") as response:
+        first = next(response.iter_lines())
+    assert json.loads(first)["event"] == "article"
+    assert api.request_limiter.active == 0
+
+
+def test_stream_is_rejected_while_every_slot_is_taken(client, monkeypatch):
+    monkeypatch.setattr(api, "request_limiter", ConcurrencyLimiter(limit=0))
+
+    response = client.get(f"/fetch-news/{COMPANY}/stream")
+
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
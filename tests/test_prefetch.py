@@ -0,0 +1,128 @@
+import functools
+import random
+import threading
+import time
+
+import pytest
+
+from utils import pipeline, scraper
+from utils.prefetch import PrefetchScheduler, load_watchlist
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella"]
+
+
+class Refresher:
+    """Refresh callable recording the companies it was called for."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, company):
+        with self._lock:
+            self.calls.append(company)
+        if company in self.failing:
+            return {"error": "No news articles found."}
+        return {"articles": []}
+
+
+def scheduler(refresh, interval=10.0, jitter=0.1, concurrency=1):
+    return PrefetchScheduler(COMPANIES, refresh, interval=interval, jitter=jitter,
+                             concurrency=concurrency, rng=random.Random(0))
+
+
+@pytest.fixture
+def stub_refresh(monkeypatch, feed_server):
+    """Refresh companies through pipeline.refresh_company, with feeds from the stub server."""
+    monkeypatch.setattr(pipeline, "fetch_news", functools.partial(scraper.fetch_news, base_url=feed_server.url))
+    keys = [pipeline.company_key(company) for company in COMPANIES]
+    yield pipeline.refresh_company
+    for key in keys:
+        pipeline.analysis_cache.invalidate(key)
+
+
+def test_first_refreshes_are_staggered_over_one_interval():
+    prefetcher = scheduler(Refresher())
+    start = time.monotonic()
+
+    assert prefetcher.take_due(start) == ["acme"]
+    assert prefetcher.take_due(start + 5.0) == ["globex", "initech"]
+    assert prefetcher.take_due(start + 10.0) == ["umbrella"]
+
+
+def test_most_requested_companies_are_refreshed_first():
+    refresh = Refresher()
+    prefetcher = scheduler(refresh)
+    for _ in range(3):
+        prefetcher.record_request("Initech")
+    prefetcher.record_request("Umbrella")
+    prefetcher.record_request("Not watched")
+
+    assert prefetcher.run_once(time.monotonic() + 10.0) == ["initech", "umbrella", "acme", "globex"]
+    assert refresh.calls == ["Initech", "Umbrella", "Acme", "Globex"]
+    assert prefetcher.status()["Initech"]["requests"] == 3
+    assert not prefetcher.watches("not watched")
+
+
+def test_refreshes_are_rescheduled_one_jittered_interval_later():
+    prefetcher = scheduler(Refresher(), interval=10.0, jitter=0.1)
+    now = time.monotonic()
+    prefetcher.run_once(now + 10.0)
+
+    assert prefetcher.take_due(now + 8.9) == []
+    assert len(prefetcher.take_due(now + 11.5)) == len(COMPANIES)
+
+
+def test_errors_are_reported_until_the_next_successful_refresh():
+    refresh = Refresher(failing={"Globex"})
+    prefetcher = scheduler(refresh)
+    prefetcher.run_once(time.monotonic() + 10.0)
+
+    status = prefetcher.status()
+    assert status["Globex"]["error"] == "No news articles found."
+    assert status["Globex"]["refreshed_at"] is None
+    assert status["Acme"]["error"] is None and status["Acme"]["refreshed_at"] is not None
+
+    refresh.failing.clear()
+    prefetcher.run_once(time.monotonic() + 30.0)
+    assert prefetcher.status()["Globex"]["error"] is None
+
+
+def test_background_thread_refreshes_until_stopped():
+    refresh = Refresher()
+    prefetcher = scheduler(refresh, interval=0.2, concurrency=2)
+    prefetcher.start()
+    time.sleep(0.5)
+    prefetcher.stop()
+
+    calls = len(refresh.calls)
+    assert set(refresh.calls) == set(COMPANIES) and calls > len(COMPANIES)
+    time.sleep(0.3)
+    assert len(refresh.calls) == calls
+
+
+def test_refreshes_fill_the_analysis_cache_from_the_feeds(stub_refresh, feed_server):
+    prefetcher = PrefetchScheduler(COMPANIES, stub_refresh, key=pipeline.company_key, concurrency=2)
+    prefetcher.run_once(time.monotonic() + prefetcher.interval)
+
+    assert all(s["refreshed_at"] is not None and s["error"] is None for s in prefetcher.status().values())
+    sent = len(feed_server.requests)
+    result = pipeline.get_company_analysis("Acme")
+    assert result["articles"] and len(feed_server.requests) == sent
+
+
+def test_failed_feeds_are_reported_and_leave_the_cache_empty(stub_refresh, feed_server):
+    feed_server.error_status = 503
+    prefetcher = PrefetchScheduler(COMPANIES[:1], stub_refresh, key=pipeline.company_key)
+    prefetcher.run_once(time.monotonic() + prefetcher.interval)
+
+    assert prefetcher.status()["Acme"]["error"]
+    assert pipeline.analysis_cache.get("acme") is None
+
+
+def test_watchlist_merges_the_variable_and_file_without_duplicates(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text("Globex\n\n  Acme  \nHooli\n", encoding="utf-8")
+
+    assert load_watchlist("Acme, Globex ,", str(path)) == ["Acme", "Globex", "Hooli"]
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from benchmarks.stub_feed_server import StubFeedServer, make_feed
+from utils.feed_cache import feed_cache
+from utils.rss_stream import TruncatedFeedError, iter_rss_entries
+from utils.scraper import build_queries, fetch_news, get_session, open_feed, stream_feed
+
+COMPANY = "Acme"
+# The first query answers fast, the others slowly; a concurrent fetch waits for the slowest only
+FAST_DELAY = 0.2
+SLOW_DELAY = 0.6
+
+
+def fetch(server, concurrent):
+    start = time.perf_counter()
+    result = fetch_news(COMPANY, num_articles=35, concurrent=concurrent, base_url=server.url,
+                        use_cache=False, analyze=False)
+    return time.perf_counter() - start, result["articles"]
+
+
+def test_concurrent_fetch_waits_for_the_slowest_feed_only():
+    queries = build_queries(COMPANY)
+    delays = {query["params"]["q"]: SLOW_DELAY for query in queries}
+    delays[queries[0]["params"]["q"]] = FAST_DELAY
+    with StubFeedServer(delays=delays, num_items=10) as server:
+        sequential, expected = fetch(server, concurrent=False)
+        concurrent, articles = fetch(server, concurrent=True)
+
+    assert len(server.requests) == 2 * len(queries)
+    assert sequential >= sum(delays.values())
+    assert max(delays.values()) <= concurrent < max(delays.values()) + FAST_DELAY
+    assert concurrent < sum(delays.values()) / 2
+    # Results are merged in query-priority order, as the sequential fetch returns them
+    assert [a["link"] for a in articles] == [a["link"] for a in expected]
+
+
+def test_fetch_stops_once_enough_articles_are_found(feed_server):
+    result = fetch_news(COMPANY, num_articles=3, concurrent=False, base_url=feed_server.url,
+                        use_cache=False, analyze=False)
+
+    assert len(result["articles"]) == 3
+    assert len(feed_server.requests) == 1
+
+
+def test_feeds_share_one_keep_alive_session():
+    assert get_session() is get_session()
+
+
+def truncated_feed(num_items=5, keep=3):
+    """A feed cut off in the middle of the item after the first `keep` ones."""
+    body = make_feed(COMPANY, num_items)
+    end = 0
+    for _ in range(keep):
+        end = body.index(b"</item>", end) + len(b"</item>")
+    return body[:body.index(b"<title>", end) + len(b"<title>") + 4]
+
+
+def test_feed_cut_off_mid_item_raises_after_the_complete_items():
+    entries = []
+    with pytest.raises(TruncatedFeedError):
+        for entry in iter_rss_entries([truncated_feed()]):
+            entries.append(entry)
+
+    assert len(entries) == 3
+
+
+def test_truncated_feed_is_cached_incomplete_and_never_revalidated():
+    query, = build_queries(COMPANY)[:1]
+    with StubFeedServer(fixture=truncated_feed()) as server:
+        assert len(list(stream_feed(open_feed(query, server.url)))) == 3
+
+        record, _ = feed_cache.lookup(feed_cache.make_key(server.url, query["params"]))
+        assert not feed_cache.is_complete(record)
+        assert record["etag"] is None and record["last_modified"] is None
+
+        ttl, feed_cache.ttl = feed_cache.ttl, 0
+        try:
+            assert len(list(stream_feed(open_feed(query, server.url, partial=True)))) == 3
+        finally:
+            feed_cache.ttl = ttl
+
+    assert len(server.requests) == 2
+    assert server.not_modified == 0
@@ -0,0 +1,28 @@
+from utils.comparative_analysis import _build_comparative_analysis
+from utils.similarity import rank_pairs
+
+
+def test_articles_without_terms_are_left_out_of_every_pair():
+    pairs = rank_pairs([["earnings"], [], ["earnings", "layoffs"], ["  "]])
+
+    assert pairs["similar"] == [(0, 2, pairs["similar"][0][2])]
+    assert [(i, j) for i, j, _ in pairs["contrasting"]] == [(0, 2)]
+
+
+def test_pairs_without_shared_terms_fall_back_to_index_order():
+    pairs = rank_pairs([["earnings"], ["layoffs"], ["merger"], ["lawsuit"]], k=3)
+
+    assert pairs["contrasting"] == [(0, 1, 0.0), (0, 2, 0.0), (0, 3, 0.0)]
+    assert pairs["similar"] == []
+
+
+def test_comparisons_name_the_articles_they_compare():
+    articles = [{"title": f"Story {i}", "source": "Example Wire"} for i in range(3)]
+    key_points = [["earnings", "guidance"], ["earnings", "guidance"], ["layoffs", "lawsuit"]]
+
+    comparisons = _build_comparative_analysis(articles, key_points)["article_comparisons"]
+
+    assert [c["comparison"] for c in comparisons[:2]] == [
+        "Article 1 focuses on earnings, guidance while Article 3 emphasizes layoffs, lawsuit",
+        "Article 2 focuses on earnings, guidance while Article 3 emphasizes layoffs, lawsuit",
+    ]
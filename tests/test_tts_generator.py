@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.tts_generator import TTSCache, iter_file
+
+AUDIO_BYTES = 1000
+
+
+class StubSynthesizer:
+    """Writes fixed-size fake audio and counts its calls."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text, language, fp):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        fp.write(f"{language}:{text}".encode("utf-8").ljust(AUDIO_BYTES, b"\0"))
+
+
+@pytest.fixture
+def synthesizer():
+    return StubSynthesizer()
+
+
+def test_identical_text_is_synthesized_once(tmp_path, synthesizer):
+    cache = TTSCache(str(tmp_path), synthesizer=synthesizer)
+
+    first = cache.get_or_create("hello")
+    assert cache.get_or_create("hello") == first
+    assert cache.get_or_create("hello", language="en") != first
+    assert synthesizer.calls == 2
+
+
+def test_concurrent_requests_share_one_synthesis(tmp_path):
+    synthesizer = StubSynthesizer(delay=0.1)
+    cache = TTSCache(str(tmp_path), synthesizer=synthesizer)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        paths = set(executor.map(lambda _: cache.get_or_create("hello"), range(8)))
+
+    assert len(paths) == 1 and synthesizer.calls == 1
+    assert os.path.getsize(paths.pop()) == AUDIO_BYTES
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+    assert cache._locks == {}
+
+
+def test_least_recently_used_audio_is_evicted(tmp_path, synthesizer):
+    cache = TTSCache(str(tmp_path), max_bytes=2 * AUDIO_BYTES, synthesizer=synthesizer)
+
+    oldest = cache.get_or_create("one")
+    used = cache.get_or_create("two")
+    past = time.time() - 60
+    os.utime(oldest, (past, past))
+    os.utime(used, (past + 1, past + 1))
+    cache.get_or_create("two")  # Refreshes its access time
+    newest = cache.get_or_create("three")
+
+    assert not os.path.exists(oldest)
+    assert os.path.exists(used) and os.path.exists(newest)
+
+
+def test_opened_audio_stays_readable_after_eviction(tmp_path, synthesizer):
+    cache = TTSCache(str(tmp_path), max_bytes=AUDIO_BYTES, synthesizer=synthesizer)
+
+    audio = cache.open_audio("hello")
+    past = time.time() - 60
+    os.utime(audio.name, (past, past))
+    cache.get_or_create("another text")
+
+    assert not os.path.exists(audio.name)
+    assert b"".join(iter_file(audio, chunk_size=64)).startswith(b"hi:hello")
+    assert audio.closed
+
+
+def test_failed_synthesis_leaves_no_file(tmp_path):
+    def failing(text, language, fp):
+        fp.write(b"partial")
+        raise RuntimeError("synthesis failed")
+
+    cache = TTSCache(str(tmp_path), synthesizer=failing)
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("hello")
+
+    assert os.listdir(tmp_path) == []
+    assert cache._locks == {}
@@ -0,0 +1,204 @@
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+import api
+from benchmarks.stub_feed_server import StubFeedServer
+from utils import pipeline, upstream
+from utils.feed_cache import feed_cache
+from utils.scraper import build_queries, close_feed, fetch_news, open_feed
+from utils.upstream import (
+    FEED_TIMEOUT_FACTOR, FEED_TIMEOUT_MAX, FEED_TIMEOUT_MIN, MIN_LATENCY_SAMPLES, Deadline, HostHealth, host_health
+)
+
+COOLDOWN = 0.05
+
+
+def open_breaker(failures=2):
+    health = HostHealth(failures=failures, cooldown=COOLDOWN)
+    for _ in range(failures):
+        assert health.allow()
+        health.record_failure()
+    return health
+
+
+def health_of(server, **kwargs):
+    """Give the stub server's host a fresh HostHealth."""
+    health = upstream._hosts[urlsplit(server.url).netloc] = HostHealth(**kwargs)
+    return health
+
+
+def fetch(server, company="Acme", budget=2.0, **kwargs):
+    deadline = Deadline(budget)
+    return fetch_news(company, base_url=server.url, analyze=False, deadline=deadline, **kwargs), deadline
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    health = open_breaker()
+
+    assert health.state == "open"
+    assert not health.allow()
+
+
+def test_breaker_lets_one_probe_through_after_the_cooldown():
+    health = open_breaker()
+    time.sleep(COOLDOWN)
+
+    assert health.allow()
+    assert health.state == "half-open"
+    assert not health.allow()
+
+    health.record_failure()
+    assert health.state == "open" and not health.allow()
+
+    time.sleep(COOLDOWN)
+    assert health.allow()
+    health.record_success(0.01)
+    assert health.state == "closed" and health.allow()
+
+
+def test_released_probe_can_be_taken_again():
+    health = open_breaker()
+    time.sleep(COOLDOWN)
+    assert health.allow()
+
+    health.release()
+
+    assert health.state == "open"
+    assert health.allow()
+
+
+def test_timeout_follows_p95_latency_and_doubles_after_timeouts():
+    health = HostHealth()
+    assert health.timeout() == FEED_TIMEOUT_MAX
+
+    for _ in range(MIN_LATENCY_SAMPLES):
+        health.record_success(0.5)
+    adaptive = max(FEED_TIMEOUT_MIN, 0.5 * FEED_TIMEOUT_FACTOR)
+    assert health.timeout() == pytest.approx(adaptive)
+    assert health.timeout(1) == pytest.approx(min(FEED_TIMEOUT_MAX, 2 * adaptive))
+    assert health.timeout(10) == FEED_TIMEOUT_MAX
+
+
+def test_only_full_length_timeouts_count_against_the_circuit():
+    health = HostHealth(failures=2, cooldown=COOLDOWN)
+
+    for _ in range(5):
+        health.record_failure(timed_out_after=FEED_TIMEOUT_MAX / 2)
+    assert health.state == "closed"
+    assert len(health.latencies) == 5
+
+    health.record_failure(timed_out_after=FEED_TIMEOUT_MAX)
+    health.record_failure(timed_out_after=FEED_TIMEOUT_MAX)
+    assert health.state == "open"
+
+
+def test_deadline_counts_down():
+    deadline = Deadline(0.05)
+    assert 0 < deadline.remaining() <= 0.05 and not deadline.expired
+    time.sleep(0.06)
+    assert deadline.remaining() == 0 and deadline.expired
+
+
+def test_failing_host_is_served_from_stale_cache_then_skipped():
+    with StubFeedServer(num_items=5) as server:
+        health = host_health(server.url)
+        fetch(server)
+        # Every cached feed is now stale
+        server.error_status = 503
+        ttl, feed_cache.ttl = feed_cache.ttl, 0
+        try:
+            start = time.perf_counter()
+            result, _ = fetch(server)
+            assert result["articles"] and time.perf_counter() - start < 2.0
+            assert health.state == "open"
+
+            sent = len(server.requests)
+            result, _ = fetch(server)
+            assert result["articles"] and len(server.requests) == sent
+        finally:
+            feed_cache.ttl = ttl
+
+
+def test_feed_closed_unread_is_not_served_as_a_stale_answer():
+    query = build_queries("Acme")[0]
+    with StubFeedServer(num_items=5) as server:
+        close_feed(open_feed(query, server.url))
+        server.error_status = 503
+        ttl, feed_cache.ttl = feed_cache.ttl, 0
+        try:
+            deadline = Deadline(2.0)
+            assert open_feed(query, server.url, deadline=deadline, partial=True) is None
+        finally:
+            feed_cache.ttl = ttl
+
+    assert deadline.failures == {"upstream_error"}
+
+
+def test_failing_host_without_cached_feeds_reports_the_reason():
+    with StubFeedServer(num_items=5, error_status=503) as server:
+        health = health_of(server, failures=100)
+        result, _ = fetch(server)
+        assert result["reason"] == "upstream_error"
+
+        health.opened_at = time.monotonic()
+        sent = len(server.requests)
+        result, _ = fetch(server, company="Globex")
+        assert result["reason"] == "circuit_open"
+        assert len(server.requests) == sent
+
+
+def test_slow_host_costs_no_more_than_the_budget():
+    with StubFeedServer(num_items=5, delay=2.0) as server:
+        start = time.perf_counter()
+        result, _ = fetch(server, budget=0.5)
+        assert time.perf_counter() - start < 1.0
+
+    assert result["reason"] == "deadline_exceeded"
+    # The budget ran out, not the host: its circuit stays closed
+    assert host_health(server.url).state == "closed"
+
+
+def test_exhausted_budget_does_not_leave_the_host_half_open(feed_server):
+    health = host_health(feed_server.url)
+    health.opened_at = time.monotonic() - health.cooldown
+
+    result, _ = fetch(feed_server, budget=0)
+    assert result["reason"] == "deadline_exceeded"
+    assert health.state == "open"
+
+    result, _ = fetch(feed_server, use_cache=False)
+    assert result["articles"]
+    assert health.state == "closed"
+
+
+@pytest.mark.parametrize("reason, status_code", [
+    (None, 404), ("deadline_exceeded", 504), ("circuit_open", 503), ("upstream_error", 503),
+])
+def test_upstream_failures_map_to_gateway_statuses(reason, status_code):
+    result = {"error": "No news."}
+    if reason:
+        result["reason"] = reason
+
+    error = api.analysis_error(result)
+
+    assert error.status_code == status_code
+    assert ("Retry-After" in (error.headers or {})) == (status_code == 503)
+
+
+def test_batch_gives_every_company_its_own_budget(monkeypatch):
+    deadlines = {}
+
+    def fake_fetch_news(company, analyze=True, store=None, deadline=None):
+        deadlines[company] = deadline
+        time.sleep(0.1)
+        return {"error": "No news articles found."}
+
+    monkeypatch.setattr(pipeline, "fetch_news", fake_fetch_news)
+    monkeypatch.setattr(pipeline, "BATCH_FETCH_CONCURRENCY", 1)
+    pipeline.analyze_companies(["Acme", "Globex", "Initech"], budget=0.15)
+
+    assert len({id(d) for d in deadlines.values()}) == 3
+    # Fetched one after another, yet the last company still had its budget left
+    assert deadlines["Initech"].remaining() > 0
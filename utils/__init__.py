@@ -1,10 +1,23 @@
 # utils/__init__.py
 # This file makes utils a Python package.
-# utils/__init__.py
+#
+# Submodules are imported on first attribute access, so `import utils` (or
+# any `from utils.x import y`) does not load every NLP backend.
+import importlib
+
+_EXPORTS = {
+    "fetch_news": "utils.scraper",
+    "analyze_sentiment": "utils.sentiment",
+    "generate_tts": "utils.tts",
+    "compare_sentiment": "utils.analysis",
+}
+
+__all__ = list(_EXPORTS)
 
-from .scraper import fetch_news
-from .sentiment import analyze_sentiment
-from .tts import generate_tts
-from .analysis import compare_sentiment
 
-__all__ = ["extract_news", "analyze_sentiment", "text_to_speech", "compare_articles"]
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
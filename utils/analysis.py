@@ -1,4 +1,4 @@
-from utils import analyze_sentiment
+from utils.sentiment import analyze_sentiments
 
 
 def compare_sentiment(articles):
@@ -7,8 +7,10 @@ def compare_sentiment(articles):
     """
     sentiment_counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
 
-    for article in articles:
-        sentiment = analyze_sentiment(article["title"])  # Use title as a sample text
+    # Use titles as sample text; all of them go to the model in shared batches
+    sentiments = analyze_sentiments([article["title"] for article in articles])
+
+    for article, sentiment in zip(articles, sentiments):
         sentiment_counts[sentiment] += 1
         article["sentiment"] = sentiment
 
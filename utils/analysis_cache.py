@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Seconds a company analysis is served from cache
+ANALYSIS_CACHE_TTL = float(os.environ.get("ANALYSIS_CACHE_TTL", "300"))
+# Maximum number of companies kept; least recently used are evicted first
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", "256"))
+
+
+class AnalysisCache:
+    """
+    TTL + LRU cache of per-company analysis results with single-flight
+    coalescing: while a result is being computed, other callers asking for
+    the same key wait for that computation instead of starting their own.
+
+    :param ttl: Seconds an entry stays fresh.
+    :param max_entries: Maximum number of entries before LRU eviction.
+    :param cacheable: Optional predicate deciding whether a computed result is
+        stored (e.g. to avoid caching error responses).
+    """
+
+    def __init__(self, ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_SIZE, cacheable=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def _get_fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key):
+        """Return the fresh cached value for a key, or None."""
+        with self._lock:
+            entry = self._get_fresh(key)
+            if entry is None:
+                return None
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def stored_at(self, key):
+        """Return the time.time() at which a fresh entry was stored, or None."""
+        with self._lock:
+            entry = self._get_fresh(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries if full."""
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key, value):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get_or_compute(self, key, compute, refresh=False):
+        """
+        Return the cached value for a key, computing it with `compute()` on a miss.
+        Concurrent misses for the same key share a single call to `compute`.
+        refresh=True recomputes even if a fresh entry exists (the old entry is
+        served to other callers until the new one is stored).
+        """
+        with self._lock:
+            entry = None if refresh else self._get_fresh(key)
+            if entry is not None:
+                self._stats["hits"] += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if self.cacheable is None or self.cacheable(value):
+                self._put(key, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key):
+        """Drop a cached entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return dict(self._stats, size=len(self._entries), inflight=len(self._inflight))
@@ -0,0 +1,174 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.nlp_models import parse_many
+from utils import metrics
+
+# Annotations kept for reuse across analyzers and requests
+ANNOTATION_CACHE_SIZE = 2048
+
+_annotations = OrderedDict()
+_lock = threading.Lock()
+annotation_stats = {"built": 0, "reused": 0}
+
+
+class Annotation:
+    """
+    What the analyzers read about one article, built from a single spaCy parse.
+
+    :param text: 'title content', the text every analyzer works on.
+    :param text_hash: SHA-1 of the whitespace-normalized text; the cache key.
+    :param content_start: Offset in `text` where the content begins.
+    :param sentences: (start, end) character offsets of each sentence.
+    :param tokens: (text, coarse POS tag) of each token.
+    :param entities: (text, label) of each named entity.
+    :param noun_chunks: Text of each noun chunk.
+    """
+
+    __slots__ = ("text", "text_hash", "content_start", "sentences", "tokens", "entities", "noun_chunks")
+
+    def __init__(self, text, text_hash, content_start, sentences, tokens, entities, noun_chunks):
+        self.text = text
+        self.text_hash = text_hash
+        self.content_start = content_start
+        self.sentences = sentences
+        self.tokens = tokens
+        self.entities = entities
+        self.noun_chunks = noun_chunks
+
+    @classmethod
+    def from_doc(cls, doc, text_hash, content_start=0):
+        # Pipelines without a parser or sentencizer leave sentences unset;
+        # summaries then fall back to truncation
+        sentences = ()
+        if doc.has_annotation("SENT_START"):
+            sentences = tuple((sent.start_char, sent.end_char) for sent in doc.sents)
+        return cls(
+            doc.text,
+            text_hash,
+            content_start,
+            sentences,
+            tuple((token.text, token.pos_) for token in doc),
+            tuple((ent.text, ent.label_) for ent in doc.ents),
+            tuple(chunk.text for chunk in doc.noun_chunks),
+        )
+
+    def with_content_start(self, content_start):
+        """This annotation with the content starting at another offset; the parse is shared."""
+        if content_start == self.content_start:
+            return self
+        return Annotation(self.text, self.text_hash, content_start, self.sentences, self.tokens,
+                          self.entities, self.noun_chunks)
+
+    @property
+    def content(self):
+        return self.text[self.content_start:]
+
+    def content_sentences(self):
+        """Sentences of the content, the first one cut where the title ends."""
+        sentences = (self.text[max(start, self.content_start):end].strip()
+                     for start, end in self.sentences if end > self.content_start)
+        return [sentence for sentence in sentences if sentence]
+
+
+def text_hash(text):
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def _matching_offset(text, offset, other):
+    """Offset in `other`, equal to `text` up to whitespace, of the character at `offset` in `text`."""
+    target = len("".join(text[:offset].split()))
+    seen = 0
+    for i, char in enumerate(other):
+        if char.isspace():
+            continue
+        if seen == target:
+            return i
+        seen += 1
+    return len(other)
+
+
+def _for_caller(annotation, text, content_start):
+    # The memo is keyed by the text alone; where the content starts is up to each caller
+    if text != annotation.text:
+        content_start = _matching_offset(text, content_start, annotation.text)
+    return annotation.with_content_start(content_start)
+
+
+def annotate_texts(texts, content_starts=None):
+    """
+    Annotations for texts, in input order.
+    Texts annotated before are reused; the rest are parsed in one nlp.pipe batch.
+    Every annotation has the content start its caller asked for, whichever
+    caller parsed the text first.
+    """
+    content_starts = content_starts or [0] * len(texts)
+    hashes = [text_hash(text) for text in texts]
+    found = {}
+    missing = {}
+    with _lock:
+        for text, key, start in zip(texts, hashes, content_starts):
+            annotation = _annotations.get(key)
+            if annotation is not None:
+                _annotations.move_to_end(key)
+                found[key] = annotation
+                annotation_stats["reused"] += 1
+            elif key not in missing:
+                missing[key] = (text, start)
+
+    if missing:
+        with metrics.stage("spacy_annotation"):
+            docs = parse_many([text for text, _ in missing.values()], "annotation")
+            built = {key: Annotation.from_doc(doc, key, start)
+                     for (key, (_, start)), doc in zip(missing.items(), docs)}
+        with _lock:
+            for key, annotation in built.items():
+                _annotations[key] = annotation
+                annotation_stats["built"] += 1
+            while len(_annotations) > ANNOTATION_CACHE_SIZE:
+                _annotations.popitem(last=False)
+        found.update(built)
+
+    return [_for_caller(found[key], text, start) for text, key, start in zip(texts, hashes, content_starts)]
+
+
+def article_text(article):
+    """The 'title content' text an article is annotated on, and where its content starts."""
+    title = article.get("title", "")
+    return f"{title} {article.get('content', '')}", len(title) + 1
+
+
+def annotate_articles(articles):
+    """
+    Annotations for article dicts, in order. Articles without a summary get
+    one from their first content sentences.
+    """
+    texts, starts = zip(*map(article_text, articles)) if articles else ((), ())
+    annotations = annotate_texts(list(texts), list(starts))
+    for article, annotation in zip(articles, annotations):
+        if "summary" not in article:
+            article["summary"] = summary_from_annotation(annotation)
+    return annotations
+
+
+def annotate(article):
+    """The annotation of one article dict."""
+    return annotate_articles([article])[0]
+
+
+@metrics.timed("extract_summary")
+def summary_from_annotation(annotation, max_sentences=3):
+    """The first sentences of an article's content, or its first 200 characters if it has none."""
+    sentences = annotation.content_sentences()
+    if sentences:
+        return " ".join(sentences[:max_sentences])
+    content = annotation.content
+    return content[:200] + "..." if len(content) > 200 else content
+
+
+def clear_annotation_cache():
+    """Forget memoized annotations and reset their counters."""
+    with _lock:
+        _annotations.clear()
+        for key in annotation_stats:
+            annotation_stats[key] = 0
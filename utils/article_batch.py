@@ -0,0 +1,268 @@
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+
+# Sentiment categories, indexed by the codes stored in ArticleBatch
+CATEGORIES = ("Negative", "Neutral", "Positive")
+_CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+# Offset stored for publish dates without a timezone (read as UTC)
+_NAIVE = -2 ** 31
+
+
+class StringColumn:
+    """Strings packed into one UTF-8 buffer with an offsets array."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+
+    def append(self, value):
+        self.data += (value or "").encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+
+class StringListColumn:
+    """A list of strings per row, stored as one StringColumn plus row offsets."""
+
+    __slots__ = ("values", "offsets")
+
+    def __init__(self):
+        self.values = StringColumn()
+        self.offsets = array("q", [0])
+
+    def append(self, items):
+        for item in items or ():
+            self.values.append(item)
+        self.offsets.append(len(self.values))
+
+    def __getitem__(self, i):
+        return [self.values[j] for j in range(self.offsets[i], self.offsets[i + 1])]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.offsets.itemsize * len(self.offsets)
+
+
+class ArticleRow:
+    """
+    Read-only view of one article in an ArticleBatch.
+    Supports attribute access (row.title) and dict-style reads
+    (row["title"], row.get("sentiment")) for code written against dicts.
+    """
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+
+    def __getattr__(self, name):
+        if name in ArticleBatch.FIELDS:
+            return self.batch.value(name, self.index)
+        raise AttributeError(name)
+
+    def __getitem__(self, name):
+        if name not in ArticleBatch.FIELDS:
+            raise KeyError(name)
+        return self.batch.value(name, self.index)
+
+    def get(self, name, default=None):
+        value = self.batch.value(name, self.index) if name in ArticleBatch.FIELDS else None
+        return default if value is None else value
+
+    def to_dict(self):
+        return self.batch.article(self.index)
+
+
+class ArticleBatch:
+    """
+    Column-oriented store for many articles.
+
+    Text fields share packed UTF-8 buffers, sources are dictionary-encoded,
+    publish dates are epoch seconds (dates without a timezone are taken as
+    UTC) plus their UTC offset, and sentiment is a float64 score plus an
+    int8 category code (NaN / -1 when not scored yet). Per-row access goes
+    through ArticleRow views; `from_articles` / `to_articles` convert from
+    and to the article dicts used by the API.
+
+    compare_sentiment is the only analysis that reads a batch. The pipeline
+    (analyze_articles, analyze_article_sets) and the API work on article
+    dicts; a batch is for large-corpus callers that build one themselves.
+    """
+
+    TEXT_FIELDS = ("title", "link", "content", "summary")
+    LIST_FIELDS = ("topics", "key_points")
+    FIELDS = TEXT_FIELDS + LIST_FIELDS + ("source", "publish_date", "sentiment")
+
+    def __init__(self):
+        self.text = {name: StringColumn() for name in self.TEXT_FIELDS}
+        self.lists = {name: StringListColumn() for name in self.LIST_FIELDS}
+        # Which rows carry each optional field, so round trips keep the dict shape
+        self.present = {name: array("b") for name in ("summary",) + self.LIST_FIELDS}
+        self.sources = []
+        self._source_codes = {}
+        self.source = array("i")
+        self.publish_date = array("d")
+        self.publish_offset = array("i")
+        self.sentiment_score = array("d")
+        self.sentiment_category = array("b")
+
+    @classmethod
+    def from_articles(cls, articles):
+        batch = cls()
+        for article in articles:
+            batch.append(article)
+        return batch
+
+    def __len__(self):
+        return len(self.source)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return ArticleRow(self, i % len(self))
+
+    def __iter__(self):
+        return (ArticleRow(self, i) for i in range(len(self)))
+
+    def append(self, article):
+        """Add one article dict; returns its row index."""
+        for name in self.TEXT_FIELDS:
+            self.text[name].append(article.get(name, ""))
+        for name in self.LIST_FIELDS:
+            self.lists[name].append(article.get(name))
+        for name, flags in self.present.items():
+            flags.append(name in article)
+
+        source = article.get("source", "Unknown Source")
+        code = self._source_codes.get(source)
+        if code is None:
+            code = self._source_codes[source] = len(self.sources)
+            self.sources.append(source)
+        self.source.append(code)
+
+        timestamp, offset = _to_timestamp(article.get("publish_date"))
+        self.publish_date.append(timestamp)
+        self.publish_offset.append(offset)
+        self.sentiment_score.append(math.nan)
+        self.sentiment_category.append(-1)
+        if article.get("sentiment"):
+            self.set_sentiment(len(self) - 1, article["sentiment"])
+        return len(self) - 1
+
+    def set_sentiment(self, i, sentiment):
+        """Store a {"category", "score"} sentiment for row i."""
+        self.sentiment_score[i] = sentiment["score"]
+        self.sentiment_category[i] = _CATEGORY_CODES[sentiment["category"]]
+
+    def value(self, name, i):
+        """One field of row i, in the article dict representation."""
+        if name in self.text:
+            if name in self.present and not self.present[name][i]:
+                return None
+            return self.text[name][i]
+        if name in self.lists:
+            return self.lists[name][i] if self.present[name][i] else None
+        if name == "source":
+            return self.sources[self.source[i]]
+        if name == "publish_date":
+            return _from_timestamp(self.publish_date[i], self.publish_offset[i])
+        if name == "sentiment":
+            code = self.sentiment_category[i]
+            if code < 0:
+                return None
+            return {"category": CATEGORIES[code], "score": self.sentiment_score[i]}
+        raise KeyError(name)
+
+    def article(self, i):
+        """Row i as an article dict, with the same keys it was added with."""
+        article = {}
+        for name in ("title", "link", "content", "summary", "publish_date", "source", "topics", "key_points"):
+            if name in self.present and not self.present[name][i]:
+                continue
+            article[name] = self.value(name, i)
+        sentiment = self.value("sentiment", i)
+        if sentiment is not None:
+            article["sentiment"] = sentiment
+        return article
+
+    def to_articles(self):
+        return [self.article(i) for i in range(len(self))]
+
+    def texts(self):
+        """'title content' of every row, the text sentiment and topics are scored on."""
+        titles, contents = self.text["title"], self.text["content"]
+        return [f"{titles[i]} {contents[i]}" for i in range(len(self))]
+
+    def sentiment_summary(self):
+        """Sentiment distribution and overall sentiment, as array reductions over scored rows."""
+        # NumPy is imported on first use
+        import numpy as np
+
+        codes = np.frombuffer(self.sentiment_category, dtype=np.int8)
+        scores = np.frombuffer(self.sentiment_score, dtype=np.float64)
+        scored = codes >= 0
+        counts = np.bincount(codes[scored], minlength=len(CATEGORIES))
+        sentiment_distribution = {"Positive": 0, "Negative": 0, "Neutral": 0}
+        for code, name in enumerate(CATEGORIES):
+            sentiment_distribution[name] = int(counts[code])
+
+        if not scored.any():
+            return {
+                "sentiment_distribution": sentiment_distribution,
+                "overall_sentiment": {"category": "Neutral", "score": 0.0}
+            }
+
+        avg_score = float(scores[scored].mean())
+        overall_category = "Positive" if avg_score > 0.1 else "Negative" if avg_score < -0.1 else "Neutral"
+        return {
+            "sentiment_distribution": sentiment_distribution,
+            "overall_sentiment": {"category": overall_category, "score": round(avg_score, 2)}
+        }
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the columns."""
+        total = sum(column.nbytes for column in self.text.values())
+        total += sum(column.nbytes for column in self.lists.values())
+        total += sum(flags.itemsize * len(flags) for flags in self.present.values())
+        for column in (self.source, self.publish_date, self.publish_offset, self.sentiment_score,
+                       self.sentiment_category):
+            total += column.itemsize * len(column)
+        return total + sum(len(source) for source in self.sources)
+
+
+def _to_timestamp(value):
+    """(epoch seconds, UTC offset in seconds) of an ISO date; naive dates are UTC."""
+    if not value:
+        return math.nan, _NAIVE
+    try:
+        date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return math.nan, _NAIVE
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc).timestamp(), _NAIVE
+    return date.timestamp(), int(date.utcoffset().total_seconds())
+
+
+def _from_timestamp(value, offset):
+    if math.isnan(value):
+        return None
+    if offset == _NAIVE:
+        return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None).isoformat()
+    return datetime.fromtimestamp(value, timezone(timedelta(seconds=offset))).isoformat()
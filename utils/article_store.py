@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from utils.dedup import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding every analyzed article; set ARTICLE_STORE_PATH="" to disable the store
+ARTICLE_STORE_PATH = os.environ.get("ARTICLE_STORE_PATH", os.path.join("cache", "articles.sqlite3"))
+# Identity of the derived fields; bump when summaries, topics, key points or sentiment change
+ANALYSIS_VERSION = "3"
+# Fields computed from an article's text and kept with it
+DERIVED_FIELDS = ("summary", "topics", "comparison_topics", "key_points", "sentiment")
+
+_WORD = re.compile(r"\w+")
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS articles ("
+    "link TEXT PRIMARY KEY, data TEXT, version TEXT, published REAL, first_seen REAL)",
+    "CREATE TABLE IF NOT EXISTS article_companies (company TEXT, link TEXT, PRIMARY KEY (company, link))",
+    "CREATE TABLE IF NOT EXISTS terms (term TEXT, kind TEXT, link TEXT, PRIMARY KEY (term, kind, link))",
+    "CREATE INDEX IF NOT EXISTS articles_published ON articles (published)",
+    "CREATE INDEX IF NOT EXISTS terms_link ON terms (link)",
+]
+
+
+def index_terms(article):
+    """
+    Yield the (term, kind) pairs an article is indexed under.
+    Every topic and key point is indexed as a whole phrase and word by word,
+    lowercased, so "azure" finds an article about "Azure cloud revenue".
+    """
+    phrases = [("topic", t) for t in article.get("topics", [])] + [("entity", k) for k in article.get("key_points", [])]
+    seen = set()
+    for kind, phrase in phrases:
+        words = _WORD.findall(phrase.lower())
+        for term in [" ".join(words)] + words:
+            if term and (term, kind) not in seen:
+                seen.add((term, kind))
+                yield term, kind
+
+
+def published_timestamp(article):
+    """Epoch seconds of an article's publish_date, or None."""
+    try:
+        return datetime.fromisoformat(article["publish_date"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ArticleStore:
+    """
+    Articles and their derived fields, keyed by canonical link.
+
+    Stored articles let a refresh skip cleaning, summarizing and annotating
+    articles it has seen before. An inverted index from topic and entity
+    terms to links answers "articles about X since T" locally.
+
+    :param path: SQLite file, or None/"" to disable the store (every lookup misses).
+    """
+
+    def __init__(self, path=ARTICLE_STORE_PATH):
+        self.path = path or None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def get(self, link):
+        """
+        Return the stored article for a link, or None.
+        Derived fields from an older ANALYSIS_VERSION are dropped so they are recomputed.
+        """
+        key = canonicalize_url(link)
+        if not self.path or not key:
+            return None
+        try:
+            row = self._connection().execute(
+                "SELECT data, version FROM articles WHERE link = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Article store read error: %s", e)
+            row = None
+
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        article = json.loads(row[0])
+        if row[1] != ANALYSIS_VERSION:
+            for field in DERIVED_FIELDS:
+                article.pop(field, None)
+        return article
+
+    def put_many(self, articles, company=None):
+        """Store articles with their derived fields and index their terms."""
+        if not self.path or not articles:
+            return
+        now = time.time()
+        try:
+            conn = self._connection()
+            with conn:
+                for article in articles:
+                    key = canonicalize_url(article.get("link", ""))
+                    if not key:
+                        continue
+                    conn.execute(
+                        "INSERT INTO articles (link, data, version, published, first_seen) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT(link) DO UPDATE SET data = excluded.data, version = excluded.version, "
+                        "published = excluded.published",
+                        (key, json.dumps(article, ensure_ascii=False), ANALYSIS_VERSION,
+                         published_timestamp(article), now)
+                    )
+                    conn.execute("DELETE FROM terms WHERE link = ?", (key,))
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO terms (term, kind, link) VALUES (?, ?, ?)",
+                        [(term, kind, key) for term, kind in index_terms(article)]
+                    )
+                    if company:
+                        conn.execute(
+                            "INSERT OR IGNORE INTO article_companies (company, link) VALUES (?, ?)",
+                            (company, key)
+                        )
+            self._count("stored", len(articles))
+        except sqlite3.Error as e:
+            logger.warning("Article store write error: %s", e)
+
+    def search(self, about=None, since=None, company=None, kind=None, limit=50):
+        """
+        Stored articles matching every given filter, newest first.
+
+        :param about: Topic or entity term, matched case-insensitively as a
+            whole word or phrase.
+        :param since: Epoch seconds; articles published (or, without a
+            publish date, first seen) earlier are left out.
+        :param company: Only articles fetched for this company key.
+        :param kind: "topic" or "entity" to search only one kind of term.
+        """
+        if not self.path:
+            return []
+        query = "SELECT a.data FROM articles a"
+        conditions, params = [], []
+        if about:
+            query += " JOIN (SELECT DISTINCT link FROM terms WHERE term = ?" + (" AND kind = ?" if kind else "") + ") t ON t.link = a.link"
+            params += [" ".join(_WORD.findall(about.lower()))] + ([kind] if kind else [])
+        if company:
+            query += " JOIN article_companies c ON c.link = a.link AND c.company = ?"
+            params.append(company)
+        if since is not None:
+            conditions.append("COALESCE(a.published, a.first_seen) >= ?")
+            params.append(since)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY COALESCE(a.published, a.first_seen) DESC, a.link LIMIT ?"
+        params.append(limit)
+        try:
+            rows = self._connection().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Article store read error: %s", e)
+            return []
+        return [json.loads(row[0]) for row in rows]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+# Shared store used by the pipeline and the /articles endpoint
+article_store = ArticleStore()
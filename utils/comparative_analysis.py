@@ -1,27 +1,27 @@
 from collections import Counter
-from itertools import combinations
-import spacy
 from urllib.parse import urlparse
+from utils.extract_topics import NO_TOPICS
+from utils.annotation import annotate, annotate_articles, annotate_texts
+from utils import metrics
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# Article pairs reported as comparisons and as similar coverage
+MAX_COMPARISONS = 5
 
+@metrics.timed("spacy_key_points")
 def extract_key_points(text):
     """Extract key points from text using spaCy."""
-    doc = nlp(text)
-    
+    return key_points_from_annotation(annotate_texts([text])[0])
+
+def key_points_from_annotation(annotation):
+    """Extract key points from an article's annotation."""
     # Extract named entities
-    entities = [ent.text for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'EVENT', 'TECH', 'MONEY', 'GPE']]
+    entities = [text for text, label in annotation.entities if label in ['ORG', 'PRODUCT', 'EVENT', 'TECH', 'MONEY', 'GPE']]
     
     # Extract important noun phrases
-    noun_phrases = [chunk.text for chunk in doc.noun_chunks if len(chunk.text.split()) > 1]
+    noun_phrases = [chunk for chunk in annotation.noun_chunks if len(chunk.split()) > 1]
     
-    # Combine and get unique key points
-    key_points = list(set(entities + noun_phrases))
+    # Combine and get unique key points, in document order
+    key_points = list(dict.fromkeys(entities + noun_phrases))
     return key_points[:5]  # Return top 5 key points
 
 def extract_source_from_url(url):
@@ -34,21 +34,64 @@ def extract_source_from_url(url):
     except:
         return "Unknown Source"
 
+def _insufficient_articles():
+    return {
+        "article_comparisons": [],
+        "similar_articles": [],
+        "key_differences": [],
+        "thematic_summary": "Insufficient articles for comparison",
+        "source_distribution": {}
+    }
+
 def generate_comparative_analysis(articles):
     """
     Generate comparative analysis between articles.
     Focuses on content differences, key points, and thematic variations.
     """
     if not articles or len(articles) < 2:
-        return {
-            "article_comparisons": [],
-            "key_differences": [],
-            "thematic_summary": "Insufficient articles for comparison",
-            "source_distribution": {}
-        }
+        return _insufficient_articles()
+
+    # Annotate every article without key points in one batch; annotations
+    # already built for topic extraction are reused
+    missing = [article for article in articles if "key_points" not in article]
+    annotations = annotate_articles(missing)
+    with metrics.stage("spacy_key_points"):
+        for article, annotation in zip(missing, annotations):
+            article["key_points"] = key_points_from_annotation(annotation)
+
+    return _build_comparative_analysis(articles, [article["key_points"] for article in articles])
+
+class ComparativeAccumulator:
+    """
+    Incremental form of generate_comparative_analysis.
+    Key points are extracted as each article is added, so the final
+    result() only pairs up already-annotated articles. Articles must carry
+    their sentiment by the time result() is called.
+    """
+
+    def __init__(self):
+        self.articles = []
+        self.key_points = []
+
+    def add(self, article):
+        if "key_points" not in article:
+            with metrics.stage("spacy_key_points"):
+                article["key_points"] = key_points_from_annotation(annotate(article))
+        self.articles.append(article)
+        self.key_points.append(article["key_points"])
+
+    def result(self):
+        if len(self.articles) < 2:
+            return _insufficient_articles()
+        return _build_comparative_analysis(self.articles, self.key_points)
+
+@metrics.timed("comparative_analysis")
+def _build_comparative_analysis(articles, article_key_points):
+    # NumPy/SciPy are imported on first use
+    from utils.similarity import rank_pairs
 
     comparisons = []
-    all_key_points = set()
+    all_key_points = {}
     sources = []
     
     # Collect sources and generate comparisons
@@ -66,18 +109,25 @@ def generate_comparative_analysis(articles):
         source: count for source, count in source_counts.most_common()
     }
     
+    # Score every pair at once on key points and topics; compare the most
+    # contrasting ones
+    article_terms = [
+        list(points) + [t for t in article.get('topics', []) if t not in NO_TOPICS]
+        for article, points in zip(articles, article_key_points)
+    ]
+    pairs = rank_pairs(article_terms, k=MAX_COMPARISONS)
+
     # Generate pairwise comparisons
-    for i, (art1, art2) in enumerate(combinations(articles, 2)):
-        if i >= 5:  # Limit to 5 comparisons to keep it manageable
-            break
-            
-        # Extract key points from both articles
-        points1 = extract_key_points(f"{art1.get('title', '')} {art1.get('content', '')}")
-        points2 = extract_key_points(f"{art2.get('title', '')} {art2.get('content', '')}")
+    for idx1, idx2, similarity in pairs["contrasting"]:
+        art1, art2 = articles[idx1], articles[idx2]
+
+        # Key points from both articles
+        points1 = article_key_points[idx1]
+        points2 = article_key_points[idx2]
         
         # Find unique points in each article
-        unique_points1 = set(points1) - set(points2)
-        unique_points2 = set(points2) - set(points1)
+        unique_points1 = [p for p in points1 if p not in points2]
+        unique_points2 = [p for p in points2 if p not in points1]
         
         # Generate impact analysis based on sentiment and content
         sentiment1 = art1.get('sentiment', {}).get('category', 'Neutral')
@@ -92,23 +142,24 @@ def generate_comparative_analysis(articles):
         comparison = {
             "article_1": {
                 "title": art1.get('title', ''),
-                "key_points": list(unique_points1)[:3],
+                "key_points": unique_points1[:3],
                 "sentiment": sentiment1,
                 "source": extract_source_from_url(art1.get('link', '')) if art1.get('link') else art1.get('source', 'Unknown Source')
             },
             "article_2": {
                 "title": art2.get('title', ''),
-                "key_points": list(unique_points2)[:3],
+                "key_points": unique_points2[:3],
                 "sentiment": sentiment2,
                 "source": extract_source_from_url(art2.get('link', '')) if art2.get('link') else art2.get('source', 'Unknown Source')
             },
-            "comparison": f"Article 1 focuses on {', '.join(list(unique_points1)[:2])} while Article 2 emphasizes {', '.join(list(unique_points2)[:2])}",
-            "impact": impact
+            "comparison": (f"Article {idx1 + 1} focuses on {', '.join(unique_points1[:2])} "
+                           f"while Article {idx2 + 1} emphasizes {', '.join(unique_points2[:2])}"),
+            "impact": impact,
+            "similarity": similarity
         }
         
         comparisons.append(comparison)
-        all_key_points.update(unique_points1)
-        all_key_points.update(unique_points2)
+        all_key_points.update(dict.fromkeys(unique_points1 + unique_points2))
     
     # Generate key differences summary
     key_differences = []
@@ -126,8 +177,18 @@ def generate_comparative_analysis(articles):
         f"Key themes include: {', '.join(key_differences[:3])}"
     )
     
+    similar_articles = [
+        {
+            "article_1": articles[idx1].get('title', ''),
+            "article_2": articles[idx2].get('title', ''),
+            "similarity": similarity
+        }
+        for idx1, idx2, similarity in pairs["similar"]
+    ]
+
     return {
         "article_comparisons": comparisons,
+        "similar_articles": similar_articles,
         "key_differences": key_differences,
         "thematic_summary": thematic_summary,
         "source_distribution": source_distribution
@@ -0,0 +1,137 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Articles whose fingerprints are at least this similar are treated as the same story
+DEDUP_SIMILARITY = 0.9
+
+SIMHASH_BITS = 64
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {"oc", "gclid", "fbclid", "mc_cid", "mc_eid", "ref", "cmpid", "ocid"}
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def canonicalize_url(url):
+    """
+    Normalize a URL so trivially different links to the same page compare equal.
+    Treats http and https alike, lowercases the host, drops "www.", fragments,
+    tracking parameters and trailing slashes, and sorts the remaining query
+    parameters.
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _features(text):
+    """Word unigrams and bigrams of the lowercased text."""
+    words = _TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def simhash(text, bits=SIMHASH_BITS):
+    """Compute a SimHash fingerprint of the text."""
+    weights = [0] * bits
+    for feature in _features(text):
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+        for i in range(bits):
+            weights[i] += 1 if h >> i & 1 else -1
+    fingerprint = 0
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def fingerprint_similarity(a, b, bits=SIMHASH_BITS):
+    """Fraction of matching bits between two SimHash fingerprints."""
+    return 1 - bin(a ^ b).count("1") / bits
+
+
+class Deduplicator:
+    """
+    Ingestion-time duplicate filter.
+
+    Exact duplicates are found with a set of canonical URLs. Near duplicates
+    (the same story syndicated under different links) are found by SimHash
+    over the cleaned title and content. Fingerprints are split into bands
+    indexed by value, so only articles sharing a band are compared: with
+    max_distance + 1 bands, any pair within the distance must share one.
+    """
+
+    def __init__(self, similarity=DEDUP_SIMILARITY):
+        self.similarity = similarity
+        self.max_distance = int(SIMHASH_BITS * (1 - similarity))
+        n_bands = min(self.max_distance + 1, SIMHASH_BITS)
+        step = SIMHASH_BITS / n_bands
+        self._bands = [(round(i * step), round((i + 1) * step)) for i in range(n_bands)]
+        self._urls = set()
+        self._band_index = [{} for _ in self._bands]
+        self.stats = {"seen": 0, "kept": 0, "duplicate_url": 0, "near_duplicate": 0}
+
+    def _band_values(self, fingerprint):
+        for start, end in self._bands:
+            yield (fingerprint >> start) & ((1 << (end - start)) - 1)
+
+    def check_url(self, url):
+        """
+        Cheap pre-check on a raw link, usable before an entry is cleaned.
+        Counts and returns "duplicate_url" for a known link, otherwise None.
+        """
+        if url and canonicalize_url(url) in self._urls:
+            self.stats["seen"] += 1
+            self.stats["duplicate_url"] += 1
+            return "duplicate_url"
+        return None
+
+    def _find_near_duplicate(self, fingerprint):
+        for index, value in zip(self._band_index, self._band_values(fingerprint)):
+            for other in index.get(value, ()):
+                if bin(fingerprint ^ other).count("1") <= self.max_distance:
+                    return other
+        return None
+
+    def add(self, article):
+        """
+        Record an article if it is new.
+        Returns None when the article was kept, otherwise the reason it was dropped.
+        """
+        self.stats["seen"] += 1
+
+        url = canonicalize_url(article.get("link", ""))
+        if url and url in self._urls:
+            self.stats["duplicate_url"] += 1
+            return "duplicate_url"
+
+        fingerprint = simhash(f"{article.get('title', '')} {article.get('content', '')}")
+        if self._find_near_duplicate(fingerprint) is not None:
+            # Remember the link so later copies are caught by the cheap check
+            if url:
+                self._urls.add(url)
+            self.stats["near_duplicate"] += 1
+            return "near_duplicate"
+
+        if url:
+            self._urls.add(url)
+        for index, value in zip(self._band_index, self._band_values(fingerprint)):
+            index.setdefault(value, []).append(fingerprint)
+        self.stats["kept"] += 1
+        return None
@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for CPU-heavy NLP stages; 0 runs them in the calling thread
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Requests processed at once before new ones are rejected with 503
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("MAX_CONCURRENT_REQUESTS", "8"))
+# Retry-After value sent with 503 responses, in seconds
+RETRY_AFTER_SECONDS = int(os.environ.get("RETRY_AFTER_SECONDS", "5"))
+# Seconds start_pool waits for the slowest worker to finish warming up
+WORKER_START_TIMEOUT = 300
+
+_pool = None
+_pool_lock = threading.Lock()
+# Set in each worker process by _warm_worker
+_start_barrier = None
+
+
+def _warm_worker(barrier):
+    """Load every NLP model once when a worker process starts."""
+    global _start_barrier
+    from utils.warmup import warm_up, mark_finished
+
+    _start_barrier = barrier
+    # A failed warm-up must not break the pool; the model then loads on first use
+    mark_finished(warm_up())
+
+
+def _worker_state():
+    from utils.warmup import state
+
+    # Hold this worker until every worker has taken one of these tasks, so
+    # each of them reports exactly once and only after its own warm-up
+    _start_barrier.wait(WORKER_START_TIMEOUT)
+    return os.getpid(), state
+
+
+def get_pool():
+    """Return the shared process pool, creating it on first use (None when disabled)."""
+    global _pool
+    if ANALYSIS_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent already runs threads (feed fetches, batching)
+            context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                mp_context=context,
+                initializer=_warm_worker,
+                initargs=(context.Barrier(ANALYSIS_WORKERS),)
+            )
+    return _pool
+
+
+def _discard_pool(pool):
+    """Drop a broken pool (e.g. a worker was killed) so the next call starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            logger.warning("Worker process pool broke; starting a new one")
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def start_pool():
+    """
+    Start every worker process now and wait until each one has loaded its models.
+    Returns the warm-up state reported by each worker, keyed by pid.
+    """
+    pool = get_pool()
+    if pool is None:
+        return {}
+    futures = [pool.submit(_worker_state) for _ in range(ANALYSIS_WORKERS)]
+    return dict(future.result() for future in futures)
+
+
+def shutdown_pool():
+    """Stop the worker processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _merged(future_result):
+    # Stage timings recorded in the worker process join this request's
+    result, observations = future_result
+    metrics.merge(observations)
+    return result
+
+
+def _submit(pool, fn, args):
+    if not metrics.METRICS_ENABLED:
+        return pool.submit(fn, *args)
+    return pool.submit(metrics.collect, fn, *args)
+
+
+def _result(value):
+    return _merged(value) if metrics.METRICS_ENABLED else value
+
+
+def run_cpu(fn, *args):
+    """
+    Run a CPU-heavy function in the process pool and wait for its result.
+    If the pool is broken the call is retried once on a new pool.
+    """
+    for attempt in range(2):
+        pool = get_pool()
+        if pool is None:
+            return fn(*args)
+        try:
+            return _result(_submit(pool, fn, args).result())
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+
+async def run_cpu_async(fn, *args):
+    """
+    Await a CPU-heavy function in the process pool without blocking the event loop.
+    If the pool is broken the call is retried once on a new pool.
+    """
+    for attempt in range(2):
+        pool = get_pool()
+        if pool is None:
+            call = functools.partial(contextvars.copy_context().run, fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(None, call)
+        try:
+            return _result(await asyncio.wrap_future(_submit(pool, fn, args)))
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+
+async def map_cpu_async(fn, items, *args):
+    """
+    Await fn(chunk, *args) over items split into one chunk per worker process.
+    fn must return a list per chunk; the results are concatenated in input order.
+    """
+    items = list(items)
+    workers = max(1, ANALYSIS_WORKERS)
+    size = -(-len(items) // workers) or 1
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    results = await asyncio.gather(*(run_cpu_async(fn, chunk, *args) for chunk in chunks))
+    return [value for chunk in results for value in chunk]
+
+
+class ConcurrencyLimiter:
+    """
+    Non-blocking counter of in-flight requests.
+    `try_acquire` fails immediately when the limit is reached, so callers can
+    shed load instead of queueing without bound.
+    """
+
+    def __init__(self, limit=MAX_CONCURRENT_REQUESTS):
+        self.limit = limit
+        self.active = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.active >= self.limit:
+                self.rejected += 1
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+    def releaser(self):
+        """
+        A callable releasing one acquired slot; calls after the first do nothing.
+        For slots that more than one cleanup path may give back.
+        """
+        once = threading.Lock()
+
+        def release():
+            if once.acquire(blocking=False):
+                self.release()
+        return release
@@ -1,28 +1,101 @@
+import hashlib
+import os
 import re
-import yake
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from utils import metrics
 
-def extract_topics(text, max_keywords=5):
-    """Extracts key topics from text using YAKE"""
+# Distinct (text, configuration) results kept by the topic memo
+TOPIC_CACHE_SIZE = int(os.environ.get("TOPIC_CACHE_SIZE", "4096"))
 
+# Returned instead of topics when none can be extracted
+NO_TOPICS = frozenset([
+    "No valid content to extract topics",
+    "Not enough content for topic extraction",
+    "No topics identified",
+])
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+memo_stats = {"hits": 0, "misses": 0}
+
+
+@lru_cache(maxsize=32)
+def get_extractor(language="en", ngram_size=2, max_keywords=5, dedup_lim=0.7):
+    """Return the shared YAKE extractor for one configuration, importing YAKE on first use."""
+    import yake
+
+    return yake.KeywordExtractor(
+        lan=language,
+        n=ngram_size,
+        top=max_keywords,
+        dedupLim=dedup_lim
+    )
+
+
+def _memo_key(text, config):
+    return hashlib.sha1(f"{config!r}\0{text}".encode("utf-8")).hexdigest()
+
+
+@metrics.timed("yake_topics")
+def extract_topics(text, max_keywords=5, language="en", ngram_size=2, dedup_lim=0.7):
+    """
+    Extracts key topics from text using YAKE.
+    Results are memoized by a hash of the text and configuration.
+    """
     if not text or not text.strip():
         return ["No valid content to extract topics"]
 
-    text = re.sub(r"[^\w\s]", "", text)  # Remove punctuation
-    text = re.sub(r"\s+", " ", text).strip()  # Normalize spaces
+    config = (language, ngram_size, max_keywords, dedup_lim)
+    key = _memo_key(text, config)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            memo_stats["hits"] += 1
+            return list(_memo[key])
+        memo_stats["misses"] += 1
+
+    topics = _extract(text, config)
+
+    with _memo_lock:
+        _memo[key] = tuple(topics)
+        while len(_memo) > TOPIC_CACHE_SIZE:
+            _memo.popitem(last=False)
+    return topics
+
+
+def keywords_from_annotation(annotation, max_keywords=5, language="en", ngram_size=2, dedup_lim=0.7):
+    """
+    YAKE topics of an annotated article's content. YAKE segments the text
+    itself, so this reads the annotation's text rather than its tokens.
+    """
+    return extract_topics(annotation.content, max_keywords, language, ngram_size, dedup_lim)
+
+
+def _extract(text, config):
+    text = _PUNCTUATION.sub("", text)  # Remove punctuation
+    text = _WHITESPACE.sub(" ", text).strip()  # Normalize spaces
 
     if len(text.split()) < 5:
         return ["Not enough content for topic extraction"]
 
-    kw_extractor = yake.KeywordExtractor(
-        lan="en",
-        n=2,  # Allow up to 2-word phrases
-        top=max_keywords,
-        dedupLim=0.7
-    )
-
-    keywords = kw_extractor.extract_keywords(text)
+    keywords = get_extractor(*config).extract_keywords(text)
 
     # Convert YAKE output to plain Python lists
     extracted_topics = [str(kw[0]) for kw in keywords]
 
     return extracted_topics if extracted_topics else ["No topics identified"]
+
+
+def extract_topics_many(texts, max_keywords=5, language="en", ngram_size=2, dedup_lim=0.7):
+    """Extract topics for many texts with one configuration, in input order."""
+    return [extract_topics(text, max_keywords, language, ngram_size, dedup_lim) for text in texts]
+
+
+def clear_topic_cache():
+    with _memo_lock:
+        _memo.clear()
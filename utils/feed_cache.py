@@ -0,0 +1,154 @@
+import logging
+import os
+import shelve
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached feed is served without contacting the feed host
+FEED_CACHE_TTL = float(os.environ.get("FEED_CACHE_TTL", "300"))
+# Optional shelve file that keeps cached feeds across restarts
+FEED_CACHE_PATH = os.environ.get("FEED_CACHE_PATH")
+# Feeds kept in memory; least recently used are evicted first (the shelve copy is kept)
+FEED_CACHE_SIZE = int(os.environ.get("FEED_CACHE_SIZE", "512"))
+
+
+class FeedCache:
+    """
+    Cache of parsed feed entries keyed by the request URL and query params.
+
+    Fresh entries (younger than `ttl`) are served directly. Stale entries keep
+    their ETag / Last-Modified validators so the next request can be made
+    conditional; a 304 reply then reuses the stored entries without
+    downloading or re-parsing the feed. A record stored from a feed whose
+    reader stopped early holds only the entries read so far and is marked
+    incomplete.
+
+    :param ttl: Seconds an entry stays fresh.
+    :param path: Optional shelve file backing the in-memory entries.
+    :param max_entries: Maximum number of entries kept in memory before LRU eviction.
+    """
+
+    def __init__(self, ttl=FEED_CACHE_TTL, path=None, max_entries=FEED_CACHE_SIZE):
+        self.ttl = ttl
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidations": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(url, params):
+        """Build a cache key from the exact URL and params of a feed request."""
+        return url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+    def lookup(self, key):
+        """
+        Return (record, fresh) for a key.
+
+        `record` is None on a miss. A stale record is still returned so its
+        validators can be sent with the next request.
+        """
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None and self.path:
+                record = self._load(key)
+                if record is not None:
+                    self._remember(key, record)
+
+            if record is None:
+                self._stats["misses"] += 1
+                return None, False
+
+            self._entries.move_to_end(key)
+
+            fresh = time.time() - record["stored_at"] < self.ttl
+            if fresh:
+                self._stats["hits"] += 1
+            return record, fresh
+
+    @staticmethod
+    def is_complete(record):
+        """Whether a record holds the whole feed (records from before the flag existed do)."""
+        return record.get("complete", True)
+
+    def conditional_headers(self, record):
+        """Build If-None-Match / If-Modified-Since headers for a stale record."""
+        headers = {}
+        if record and record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record and record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    def store(self, key, entries, etag=None, last_modified=None, complete=True):
+        """
+        Store freshly parsed entries with the response validators.
+        complete=False marks `entries` as only the beginning of the feed.
+        """
+        record = {
+            "entries": entries,
+            "etag": etag,
+            "last_modified": last_modified,
+            "complete": complete,
+            "stored_at": time.time()
+        }
+        with self._lock:
+            self._remember(key, record)
+            self._stats["stores"] += 1
+            self._save(key, record)
+        return record
+
+    def revalidated(self, key):
+        """Mark a record as fresh again after the server answered 304."""
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                return None
+            record["stored_at"] = time.time()
+            self._stats["revalidations"] += 1
+            self._save(key, record)
+            return record
+
+    def _remember(self, key, record):
+        self._entries[key] = record
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self):
+        """Return a snapshot of the hit, miss, revalidation, store and eviction counters."""
+        with self._lock:
+            return dict(self._stats, size=len(self._entries))
+
+    def clear(self):
+        """Drop every cached feed, including the on-disk copy."""
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                with shelve.open(self.path) as db:
+                    db.clear()
+
+    def _load(self, key):
+        try:
+            with shelve.open(self.path) as db:
+                return db.get(key)
+        except Exception as e:
+            logger.warning("Feed cache read error: %s", e)
+            return None
+
+    def _save(self, key, record):
+        if not self.path:
+            return
+        try:
+            with shelve.open(self.path) as db:
+                db[key] = record
+        except Exception as e:
+            logger.warning("Feed cache write error: %s", e)
+
+
+# Shared cache used by fetch_news
+feed_cache = FeedCache(ttl=FEED_CACHE_TTL, path=FEED_CACHE_PATH, max_entries=FEED_CACHE_SIZE)
@@ -0,0 +1,188 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+# Set METRICS_ENABLED=0 to turn every timer and counter into a no-op
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+# Upper bounds, in seconds, of the latency histogram buckets
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (stage, seconds) observations of the current request; None outside a request
+_observations = contextvars.ContextVar("observations", default=None)
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_NULL = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout."""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+def observe(name, seconds, family="stage"):
+    """Record one duration in the histogram and in the current request's breakdown."""
+    with _lock:
+        histogram = _histograms.get((family, name))
+        if histogram is None:
+            histogram = _histograms[(family, name)] = Histogram()
+        histogram.observe(seconds)
+    observations = _observations.get()
+    if observations is not None and family == "stage":
+        observations.append((name, seconds))
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+
+
+def stage(name):
+    """Context manager timing one pipeline stage."""
+    if not METRICS_ENABLED:
+        return _NULL
+    return _Timer(name)
+
+
+def timed(name):
+    """Decorator timing every call of a function as a pipeline stage."""
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Increment a counter."""
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def start_request():
+    """Start collecting this context's stage timings; returns a token for end_request."""
+    return _observations.set([])
+
+
+def end_request(token):
+    """Stop collecting and return the request's timings as {stage: (seconds, calls)}."""
+    observations = _observations.get() or []
+    _observations.reset(token)
+    return summarize(observations)
+
+
+def summarize(observations):
+    timings = {}
+    for name, seconds in observations:
+        total, calls = timings.get(name, (0.0, 0))
+        timings[name] = (total + seconds, calls + 1)
+    return timings
+
+
+def server_timing(timings):
+    """Format request timings as a Server-Timing header value (milliseconds)."""
+    return ", ".join(
+        f'{name};dur={seconds * 1000:.1f};desc="{calls}x"'
+        for name, (seconds, calls) in timings.items()
+    )
+
+
+def bind(fn):
+    """
+    Wrap fn to run in a copy of the caller's context, so stages timed in
+    another thread are added to the caller's request.
+    """
+    if not METRICS_ENABLED:
+        return fn
+    context = contextvars.copy_context()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def collect(fn, *args):
+    """
+    Run fn in a worker process and return (result, observations), so the
+    parent can merge the worker's timings with merge().
+    """
+    token = _observations.set([])
+    try:
+        result = fn(*args)
+        return result, _observations.get()
+    finally:
+        _observations.reset(token)
+
+
+def merge(observations):
+    """Record observations returned by collect() in this process."""
+    for name, seconds in observations:
+        observe(name, seconds)
+
+
+def render():
+    """All histograms and counters in the Prometheus text exposition format."""
+    with _lock:
+        histograms = sorted((key, h.counts[:], h.sum, h.count) for key, h in _histograms.items())
+        counters = sorted(_counters.items())
+
+    lines = []
+    families = {
+        "stage": ("news_stage_seconds", "stage", "Time spent in each pipeline stage"),
+        "http": ("news_http_request_seconds", "route", "HTTP request latency by route"),
+    }
+    for family, (metric, label, help_text) in families.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for (kind, name), counts, total, n in histograms:
+            if kind != family:
+                continue
+            cumulative = 0
+            for bound, bucket in zip(HISTOGRAM_BUCKETS + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{{label}="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{label}="{name}"}} {total}')
+            lines.append(f'{metric}_count{{{label}="{name}"}} {n}')
+
+    lines.append("# HELP news_events_total Pipeline event counters")
+    lines.append("# TYPE news_events_total counter")
+    for name, value in counters:
+        lines.append(f'news_events_total{{event="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
@@ -0,0 +1,84 @@
+import os
+import threading
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Texts per nlp.pipe batch and worker processes used for parsing
+SPACY_BATCH_SIZE = int(os.environ.get("SPACY_BATCH_SIZE", "64"))
+SPACY_N_PROCESS = int(os.environ.get("SPACY_N_PROCESS", "1"))
+
+# Components no caller reads; they are never loaded
+EXCLUDED_COMPONENTS = ["lemmatizer"]
+
+# Components each caller needs. Article annotations need sentences and noun
+# chunks (parser plus POS tags from tagger + attribute_ruler) and entities.
+PIPELINE_PROFILES = {
+    "annotation": {"tok2vec", "tagger", "attribute_ruler", "parser", "ner"},
+}
+
+_models = {}
+_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+parse_stats = {"pipe_calls": 0, "docs_parsed": 0}
+
+
+class ModelNotInstalledError(RuntimeError):
+    """Raised when a spaCy pipeline is requested but not installed."""
+
+
+def get_nlp(name=DEFAULT_MODEL):
+    """
+    Return the shared spaCy pipeline, loading it on first use.
+    Every module uses the same instance, so each model is in memory once.
+    """
+    nlp = _models.get(name)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        nlp = _models.get(name)
+        if nlp is None:
+            import spacy
+
+            try:
+                nlp = spacy.load(name, exclude=EXCLUDED_COMPONENTS)
+            except OSError as e:
+                raise ModelNotInstalledError(
+                    f"spaCy model '{name}' is not installed. "
+                    f"Install it with: python -m spacy download {name}"
+                ) from e
+            _models[name] = nlp
+    return nlp
+
+
+def disabled_components(nlp, profile):
+    """Names of the loaded components a profile does not need."""
+    needed = PIPELINE_PROFILES[profile]
+    return [name for name in nlp.pipe_names if name not in needed]
+
+
+def parse_many(texts, profile, batch_size=SPACY_BATCH_SIZE, n_process=SPACY_N_PROCESS, name=DEFAULT_MODEL):
+    """
+    Parse texts with nlp.pipe and return their Docs in input order.
+
+    Repeated texts are parsed once, all in one batched call. Docs are not
+    kept: callers reuse what they extract from them (see utils.annotation).
+    """
+    nlp = get_nlp(name)
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return []
+    parsed = dict(zip(unique, nlp.pipe(unique, disable=disabled_components(nlp, profile),
+                                        batch_size=batch_size, n_process=n_process)))
+    with _stats_lock:
+        parse_stats["pipe_calls"] += 1
+        parse_stats["docs_parsed"] += len(unique)
+    return [parsed[text] for text in texts]
+
+
+def reset_parse_stats():
+    """Reset the parse counters."""
+    with _stats_lock:
+        for key in parse_stats:
+            parse_stats[key] = 0
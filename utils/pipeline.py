@@ -0,0 +1,298 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from utils.scraper import GOOGLE_NEWS_RSS_URL, compare_articles, fetch_news, iter_articles, no_articles_error
+from utils.extract_topics import keywords_from_annotation
+from utils.comparative_analysis import ComparativeAccumulator, generate_comparative_analysis
+from utils.sentiment_analysis import SentimentAccumulator, compare_sentiment
+from utils.analysis_cache import AnalysisCache
+from utils.article_store import article_store
+from utils.execution import run_cpu
+from utils.upstream import Deadline
+from utils.dedup import canonicalize_url
+from utils.annotation import ANNOTATION_CACHE_SIZE, annotate_articles
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Companies whose feeds are fetched at once by a batch request
+BATCH_FETCH_CONCURRENCY = int(os.environ.get("BATCH_FETCH_CONCURRENCY", "4"))
+# Unique articles annotated together; stays within the annotation memo so
+# per-company analysis reuses every annotation
+BATCH_NLP_CHUNK = ANNOTATION_CACHE_SIZE // 2
+
+# Shared by every endpoint that needs a company's analysis; error results are not cached
+analysis_cache = AnalysisCache(cacheable=lambda result: "error" not in result)
+
+
+def analyze_company(company_name, deadline=None):
+    """
+    Fetch and analyze news articles for a given company.
+    Returns:
+        dict: Either the complete analysis (articles, analysis, sentiment_analysis,
+        comparative_analysis) or an 'error' key with an error message.
+
+    Fetching runs in the calling thread; the NLP stages run in the shared
+    worker process pool. Articles already in the article store keep their
+    stored annotations, so only new ones are analyzed; all of them are
+    stored again afterwards. `deadline` (an upstream.Deadline) bounds the
+    time spent on feed requests.
+    """
+    result = fetch_news(company_name, analyze=False, store=article_store, deadline=deadline)
+
+    # Check if there was an error
+    if isinstance(result, dict) and "error" in result:
+        return result
+
+    result = run_cpu(analyze_articles, result["articles"])
+    article_store.put_many(result["articles"], company_key(company_name))
+    return result
+
+
+def analyze_articles(articles):
+    """
+    Run every NLP stage over fetched articles and build the complete response.
+    CPU-bound and self-contained, so it can run in a worker process.
+    Every new article is parsed once into a shared annotation (which also
+    gives it its summary); all stages below read from it. Articles from
+    the store already carry every derived field and are not parsed at all.
+    """
+    add_topics(articles)
+    analysis = run_compare_articles(articles)
+
+    # Perform sentiment analysis
+    sentiment_analysis = compare_sentiment(articles)
+
+    # Generate comparative analysis
+    comparative = generate_comparative_analysis(articles)
+
+    # Structure the complete response
+    return {
+        "articles": articles,
+        "analysis": analysis,
+        "sentiment_analysis": sentiment_analysis,
+        "comparative_analysis": format_comparative_analysis(comparative)
+    }
+
+
+def add_topics(articles):
+    """Add summaries and topics to the articles that lack them, annotating those in one batch."""
+    missing = [article for article in articles if "topics" not in article or "summary" not in article]
+    for article, annotation in zip(missing, annotate_articles(missing)):
+        if "topics" not in article:
+            article["topics"] = keywords_from_annotation(annotation)
+
+
+def run_compare_articles(articles):
+    """Generate article comparisons and topic analysis; {} if spaCy fails."""
+    try:
+        return compare_articles(articles) or {}
+    except Exception as e:
+        logger.exception("Error during analysis: %s", e)
+        return {}
+
+
+def format_comparative_analysis(comparative):
+    """Format comparative analysis for frontend compatibility."""
+    return {
+        "coverage_summary": comparative["thematic_summary"],
+        "insights": [
+            f"Comparison {i+1}: {comp['comparison']} - {comp['impact']}"
+            for i, comp in enumerate(comparative["article_comparisons"])
+        ],
+        "key_differences": comparative["key_differences"],
+        "article_comparisons": comparative["article_comparisons"],
+        "similar_articles": comparative["similar_articles"],
+        "source_distribution": {
+            "sources": [{"name": source, "count": count} for source, count in comparative["source_distribution"].items()],
+            "total_sources": len(comparative["source_distribution"])
+        }
+    }
+
+
+def iter_company_events(company_name, base_url=GOOGLE_NEWS_RSS_URL, deadline=None):
+    """
+    Analyze a company's news incrementally, yielding (event, data) pairs.
+
+    Each article is annotated (summary, topics, sentiment, key points) and yielded as
+    an "article" event as soon as the scraper produces it; the aggregate
+    "analysis", "sentiment_analysis" and "comparative_analysis" sections
+    follow once the feeds are exhausted, then "done". A company with no
+    articles yields a single "error" event. Cached analyses are replayed
+    without refetching, and a completed run is stored in the analysis cache
+    and the article store.
+    """
+    company_name = company_name.strip()
+    key = company_key(company_name)
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        for article in cached["articles"]:
+            yield "article", article
+        for section in ("analysis", "sentiment_analysis", "comparative_analysis"):
+            yield section, cached[section]
+        yield "done", {"count": len(cached["articles"]), "cached": True}
+        return
+
+    articles = []
+    sentiment = SentimentAccumulator()
+    comparative = ComparativeAccumulator()
+    for article in iter_articles(company_name, base_url=base_url, store=article_store, deadline=deadline):
+        add_topics([article])
+        sentiment.add(article)
+        comparative.add(article)
+        articles.append(article)
+        yield "article", article
+
+    if not articles:
+        yield "error", no_articles_error(deadline)
+        return
+
+    result = {
+        "articles": articles,
+        "analysis": run_compare_articles(articles),
+        "sentiment_analysis": sentiment.result(),
+        "comparative_analysis": format_comparative_analysis(comparative.result())
+    }
+    for section in ("analysis", "sentiment_analysis", "comparative_analysis"):
+        yield section, result[section]
+
+    analysis_cache.put(key, result)
+    article_store.put_many(articles, key)
+    yield "done", {"count": len(articles), "cached": False}
+
+
+def company_key(company_name):
+    """Normalize a company name into its analysis cache key."""
+    return " ".join(company_name.split()).lower()
+
+
+def get_company_analysis(company_name, deadline=None):
+    """
+    Return the analysis for a company from the shared cache, computing it on a miss.
+    Concurrent requests for the same company wait on one computation.
+    """
+    company_name = company_name.strip()
+    return analysis_cache.get_or_compute(
+        company_key(company_name),
+        lambda: analyze_company(company_name, deadline)
+    )
+
+
+def refresh_company(company_name):
+    """Recompute a company's analysis and replace its cache entry (used by the prefetch scheduler)."""
+    company_name = company_name.strip()
+    return analysis_cache.get_or_compute(
+        company_key(company_name),
+        lambda: analyze_company(company_name),
+        refresh=True
+    )
+
+
+def tts_summary_text(company_name, result):
+    """Hindi text read out by the TTS summary of a company analysis."""
+    sentiment_data = result["sentiment_analysis"]
+    return (
+        f"कंपनी {company_name} के लिए समाचार विश्लेषण। "
+        f"कुल {len(result['articles'])} समाचार लेख मिले, जिनमें से "
+        f"{sentiment_data['sentiment_distribution']['Positive']} सकारात्मक, "
+        f"{sentiment_data['sentiment_distribution']['Negative']} नकारात्मक, और "
+        f"{sentiment_data['sentiment_distribution']['Neutral']} तटस्थ हैं। "
+        f"समग्र भावना {sentiment_data['overall_sentiment']['category']} है।"
+    )
+
+
+def analyze_companies(companies, budget=None):
+    """
+    Fetch and analyze news for many companies in one call.
+
+    Feeds are fetched concurrently (bounded by BATCH_FETCH_CONCURRENCY and
+    the scraper's per-host limit). Articles shared between companies are
+    merged by canonical link, so each is annotated once, and all texts go
+    through spaCy, topic extraction and sentiment in large batches. Each
+    successful result is also stored in the analysis cache and the article store.
+    `budget` is the seconds each company's feed requests may take, counted
+    from when its fetch starts.
+    Returns:
+        dict: 'results' mapping each company to the same shape get_news
+        returns (or an 'error' key), plus article counts.
+    """
+    # Keep the first spelling of each company, in request order
+    names = {}
+    for company in companies:
+        company = company.strip()
+        if company and company_key(company) not in names:
+            names[company_key(company)] = company
+    companies = list(names.values())
+
+    if not companies:
+        return {"results": {}, "total_articles": 0, "unique_articles": 0}
+
+    def fetch(company):
+        deadline = Deadline(budget) if budget is not None else None
+        return fetch_news(company, analyze=False, store=article_store, deadline=deadline)
+
+    workers = min(BATCH_FETCH_CONCURRENCY, len(companies))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = dict(zip(companies, executor.map(metrics.bind(fetch), companies)))
+
+    results = {}
+    company_articles = {}
+    shared = {}
+    total = 0
+    for company, result in fetched.items():
+        if "error" in result:
+            results[company] = result
+            continue
+        articles = []
+        for article in result["articles"]:
+            key = canonicalize_url(article.get("link", "")) or id(article)
+            articles.append(shared.setdefault(key, article))
+        company_articles[company] = articles
+        total += len(articles)
+
+    if company_articles:
+        results.update(run_cpu(analyze_article_sets, company_articles))
+
+    for company in companies:
+        if "error" not in results[company]:
+            analysis_cache.put(company_key(company), results[company])
+            article_store.put_many(results[company]["articles"], company_key(company))
+
+    return {
+        "results": {company: results[company] for company in companies},
+        "total_articles": total,
+        "unique_articles": len(shared)
+    }
+
+
+def analyze_article_sets(company_articles):
+    """
+    Analyze several companies' article lists that may share article objects.
+    Unique articles are annotated in chunks: one spaCy pass, one topic
+    extraction and one sentiment score each, then every company in the chunk
+    is analyzed from those shared annotations.
+    """
+    results = {}
+    chunk = {}
+    seen = {}
+
+    def flush():
+        unique = list(seen.values())
+        add_topics(unique)
+        compare_sentiment(unique)
+        for company, articles in chunk.items():
+            results[company] = analyze_articles(articles)
+        chunk.clear()
+        seen.clear()
+
+    for company, articles in company_articles.items():
+        new = {id(a): a for a in articles if id(a) not in seen and "topics" not in a}
+        if chunk and len(seen) + len(new) > BATCH_NLP_CHUNK:
+            flush()
+            new = {id(a): a for a in articles if "topics" not in a}
+        chunk[company] = articles
+        seen.update(new)
+    if chunk:
+        flush()
+
+    return results
@@ -0,0 +1,165 @@
+import heapq
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from utils.analysis_cache import ANALYSIS_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Companies kept warm in the analysis cache: a comma-separated list, or a
+# file with one company per line
+WATCHLIST = os.environ.get("WATCHLIST", "")
+WATCHLIST_FILE = os.environ.get("WATCHLIST_FILE")
+# Seconds between refreshes of one company; below the cache TTL so entries never expire
+PREFETCH_INTERVAL = float(os.environ.get("PREFETCH_INTERVAL", str(ANALYSIS_CACHE_TTL * 0.8)))
+# Random spread of each refresh time, as a fraction of the interval
+PREFETCH_JITTER = float(os.environ.get("PREFETCH_JITTER", "0.1"))
+# Companies refreshed at once
+PREFETCH_CONCURRENCY = int(os.environ.get("PREFETCH_CONCURRENCY", "2"))
+
+
+def load_watchlist(names=WATCHLIST, path=WATCHLIST_FILE):
+    """Companies from the WATCHLIST variable and WATCHLIST_FILE, without duplicates."""
+    companies = names.split(",")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            companies += f.read().splitlines()
+    return list(dict.fromkeys(" ".join(name.split()) for name in companies if name.strip()))
+
+
+class PrefetchScheduler:
+    """
+    Background refresher that keeps a watchlist of companies warm.
+
+    The first refreshes are staggered evenly over one interval, and each
+    company is then refreshed every `interval` seconds +/- `jitter`, so
+    feed requests are spread out instead of arriving in bursts. When
+    several companies are due at once, the most requested go first.
+
+    :param refresh: Callable(company) recomputing and caching one company's
+        analysis; returns the result, or a dict with an 'error' key.
+    :param key: Callable normalizing a company name (the analysis cache key).
+    """
+
+    def __init__(self, companies, refresh, key=str.lower, interval=PREFETCH_INTERVAL,
+                 jitter=PREFETCH_JITTER, concurrency=PREFETCH_CONCURRENCY, rng=None):
+        self.refresh = refresh
+        self.key = key
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = max(1, concurrency)
+        self.rng = rng or random.Random()
+        self.requests = Counter()
+        self.refreshed_at = {}
+        self.errors = {}
+        self._names = {}
+        self._due = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+
+        for company in companies:
+            self._names[key(company)] = company
+        self._stagger(time.monotonic())
+
+    def _stagger(self, now):
+        """Spread the first refreshes evenly over one interval, starting at `now`."""
+        with self._lock:
+            step = self.interval / max(1, len(self._names))
+            self._due = [(now + i * step, key) for i, key in enumerate(self._names)]
+
+    @property
+    def companies(self):
+        return list(self._names.values())
+
+    def watches(self, key):
+        return key in self._names
+
+    def record_request(self, company):
+        """Count a request for a watched company; more requested companies are refreshed first."""
+        key = self.key(company)
+        if key in self._names:
+            with self._lock:
+                self.requests[key] += 1
+
+    def _next_delay(self):
+        return self.interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def take_due(self, now=None):
+        """Remove and return the keys due by `now`, most requested first."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = []
+            while self._due and self._due[0][0] <= now:
+                due.append(heapq.heappop(self._due)[1])
+            return sorted(due, key=lambda k: (-self.requests[k], k))
+
+    def _refresh_one(self, key):
+        if self._stop.is_set():
+            return
+        company = self._names[key]
+        try:
+            result = self.refresh(company)
+            error = result.get("error") if isinstance(result, dict) else None
+        except Exception as e:
+            error = str(e)
+        with self._lock:
+            if error:
+                logger.warning("Prefetch of %s failed: %s", company, error)
+                self.errors[key] = error
+            else:
+                self.refreshed_at[key] = time.time()
+                self.errors.pop(key, None)
+            heapq.heappush(self._due, (time.monotonic() + self._next_delay(), key))
+
+    def run_once(self, now=None):
+        """Refresh every company due by `now` and wait for them; returns the keys, in priority order."""
+        due = self.take_due(now)
+        if due:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(due))) as executor:
+                list(executor.map(self._refresh_one, due))
+        return due
+
+    def seconds_until_due(self):
+        with self._lock:
+            if not self._due:
+                return self.interval
+            return max(0.0, self._due[0][0] - time.monotonic())
+
+    def _run(self, executor):
+        # Refreshes run on the executor, so a slow one doesn't hold back the others' schedule
+        while not self._stop.is_set():
+            for key in self.take_due():
+                executor.submit(self._refresh_one, key)
+            self._stop.wait(self.seconds_until_due())
+
+    def start(self):
+        if self._thread is None and self._names:
+            self._stagger(time.monotonic())
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="prefetch")
+            self._thread = threading.Thread(target=self._run, args=(self._executor,), name="prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._executor.shutdown(wait=True)
+            self._thread = None
+
+    def status(self):
+        """Per-company request counts, last successful refresh (epoch seconds) and last error."""
+        with self._lock:
+            return {
+                company: {
+                    "requests": self.requests[key],
+                    "refreshed_at": self.refreshed_at.get(key),
+                    "error": self.errors.get(key),
+                }
+                for key, company in self._names.items()
+            }
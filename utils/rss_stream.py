@@ -0,0 +1,92 @@
+import logging
+import xml.etree.ElementTree as ET
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+
+class TruncatedFeedError(ValueError):
+    """The feed became malformed (e.g. was cut off) after some of its items were yielded."""
+
+    def __init__(self, yielded, error):
+        super().__init__(f"feed became malformed after {yielded} entries: {error}")
+        self.yielded = yielded
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def item_to_entry(item):
+    """
+    Convert an RSS <item> element into a dict with the same keys feedparser
+    uses for the fields we read (title, link, description/summary,
+    published, source).
+    """
+    entry = {}
+    for child in item:
+        # Namespaced extensions (media:content, ...) are not used
+        if "}" in child.tag:
+            continue
+        text = "".join(child.itertext())
+        if child.tag == "source":
+            entry["source"] = {"title": text, "href": child.get("url")}
+        elif child.tag == "pubDate":
+            entry["published"] = text
+        elif child.tag == "description":
+            entry["description"] = entry["summary"] = text
+        elif child.tag in ("title", "link", "guid"):
+            entry[child.tag] = text
+    return entry
+
+
+def iter_rss_entries(chunks):
+    """
+    Parse RSS items incrementally from an iterable of byte chunks.
+
+    Each <item> is yielded as soon as its closing tag arrives and is then
+    dropped from the tree, so memory does not grow with the feed and the
+    caller can stop reading (and close the connection) at any point.
+
+    Documents the pull parser rejects before the first item, or that contain
+    no RSS items at all (e.g. Atom), are handed to feedparser instead. Raw
+    bytes are only kept until the first item is yielded; a document that
+    turns malformed or ends early after that raises TruncatedFeedError, so
+    the caller knows the entries it got are not the whole feed.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    chunks = iter(chunks)
+    stack = []
+    buffered = []
+    yielded = 0
+
+    try:
+        for chunk in chunks:
+            if buffered is not None:
+                buffered.append(chunk)
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if _local_name(elem.tag) != "item":
+                    continue
+
+                entry = item_to_entry(elem)
+                if stack:
+                    stack[-1].remove(elem)
+                buffered = None
+                yielded += 1
+                yield entry
+        parser.close()
+    except ET.ParseError as e:
+        if buffered is None:
+            raise TruncatedFeedError(yielded, e) from e
+        logger.info("Malformed feed, falling back to feedparser: %s", e)
+        body = b"".join(buffered) + b"".join(chunks)
+        yield from feedparser.parse(body).entries
+        return
+
+    if not yielded and buffered:
+        yield from feedparser.parse(b"".join(buffered)).entries
@@ -1,63 +1,65 @@
+import logging
+import os
 import requests
-import nltk
 from datetime import datetime
-import re
 import feedparser
-from bs4 import BeautifulSoup
-import html
 from collections import Counter
-from itertools import combinations
-import spacy
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('averaged_perceptron_tagger')
-    nltk.download('stopwords')
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from utils.feed_cache import feed_cache
+from utils.dedup import DEDUP_SIMILARITY, Deduplicator
+from utils.annotation import annotate_articles, annotate_texts
+from utils.text_normalize import normalize_entry, normalize_text
+from utils.rss_stream import TruncatedFeedError, iter_rss_entries
+from utils import metrics, upstream
+from utils.upstream import FEED_RETRIES, FEED_TIMEOUT_MIN
+
+logger = logging.getLogger(__name__)
+
+# Google News RSS feed URL; NEWS_RSS_URL points the app at another feed server (e.g. the benchmark stub)
+GOOGLE_NEWS_RSS_URL = os.environ.get("NEWS_RSS_URL", "https://news.google.com/rss/search")
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+MAX_FEED_WORKERS = 8
+# Requests waiting on the same feed host at once, across all companies
+MAX_REQUESTS_PER_HOST = int(os.environ.get("MAX_REQUESTS_PER_HOST", "8"))
+# Keep-alive connections kept per host by the shared session
+POOL_MAXSIZE = 32
+# Bytes read from the socket per step when streaming a feed
+STREAM_CHUNK_SIZE = 4096
+# Error message for a company without articles, by the upstream failure behind it
+NO_ARTICLES_ERRORS = {
+    "deadline_exceeded": "News feeds did not answer in time. Please try again.",
+    "circuit_open": "News feeds are temporarily unavailable. Please try again later.",
+    "upstream_error": "News feeds could not be fetched. Please try again later.",
+}
+
+_session = None
+_session_lock = threading.Lock()
+_host_slots = {}
 
 def clean_text(text):
     """Clean and normalize text content."""
-    if not text:
-        return ""
-    # Decode HTML entities
-    text = html.unescape(text)
-    # Remove HTML tags
-    text = BeautifulSoup(text, "html.parser").get_text()
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    # Remove special characters but keep punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    return text
-
-def extract_summary(text, max_sentences=3):
-    """Extract a summary from text using NLTK."""
-    try:
-        sentences = nltk.sent_tokenize(text)
-        return ' '.join(sentences[:max_sentences])
-    except:
-        return text[:200] + "..." if len(text) > 200 else text
+    return normalize_text(text)
 
 def extract_topics(text):
     """Extract main topics from text using spaCy."""
-    doc = nlp(text)
-    
+    return topics_from_annotation(annotate_texts([text])[0])
+
+def topics_from_annotation(annotation):
+    """Extract main topics from an article's annotation."""
     # Extract named entities
-    entities = [ent.text for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'EVENT', 'TECH']]
+    entities = [text for text, label in annotation.entities if label in ['ORG', 'PRODUCT', 'EVENT', 'TECH']]
     
     # Extract noun phrases
-    noun_phrases = [chunk.text for chunk in doc.noun_chunks]
+    noun_phrases = list(annotation.noun_chunks)
     
     # Extract important words (nouns and proper nouns)
-    important_words = [token.text for token in doc if token.pos_ in ['NOUN', 'PROPN']]
+    important_words = [text for text, pos in annotation.tokens if pos in ['NOUN', 'PROPN']]
     
     # Combine and get most common topics
     all_topics = entities + noun_phrases + important_words
@@ -72,37 +74,37 @@ def compare_articles(articles):
         return None
         
     coverage_differences = []
-    all_topics = set()
-    articles_topics = []
     
-    # Extract topics for each article
-    for article in articles:
-        combined_text = f"{article['title']} {article['content']}"
-        topics = extract_topics(combined_text)
-        articles_topics.append(topics)
-        all_topics.update(topics)
+    # Extract topics for every article that has none yet (stored articles
+    # keep theirs), annotating those in one batch
+    missing = [article for article in articles if "comparison_topics" not in article]
+    annotations = annotate_articles(missing)
+    with metrics.stage("spacy_topics"):
+        for article, annotation in zip(missing, annotations):
+            article["comparison_topics"] = topics_from_annotation(annotation)
+    articles_topics = [article["comparison_topics"] for article in articles]
     
-    # Generate comparisons between pairs of articles
-    for i, (art1, art2) in enumerate(combinations(range(len(articles)), 2)):
-        if i >= 5:  # Limit to 5 comparisons
-            break
-            
-        topics1 = set(articles_topics[art1])
-        topics2 = set(articles_topics[art2])
+    # Score every pair at once and compare the most contrasting ones
+    # (NumPy/SciPy are imported on first use)
+    from utils.similarity import rank_pairs
+
+    for art1, art2, _ in rank_pairs(articles_topics, k=5)["contrasting"]:
+        topics1 = articles_topics[art1]
+        topics2 = articles_topics[art2]
         
         # Determine the main focus of each article
-        focus1 = next((t for t in topics1 if t.lower() not in ['microsoft', 'company']), list(topics1)[0] if topics1 else "general news")
-        focus2 = next((t for t in topics2 if t.lower() not in ['microsoft', 'company']), list(topics2)[0] if topics2 else "general news")
+        focus1 = next((t for t in topics1 if t.lower() not in ['microsoft', 'company']), topics1[0] if topics1 else "general news")
+        focus2 = next((t for t in topics2 if t.lower() not in ['microsoft', 'company']), topics2[0] if topics2 else "general news")
         
         # Generate impact based on the topics
         impact = ""
-        if any(t.lower() in ['security', 'hack', 'threat', 'vulnerability', 'attack'] for t in topics1.union(topics2)):
+        if any(t.lower() in ['security', 'hack', 'threat', 'vulnerability', 'attack'] for t in topics1 + topics2):
             impact = "This highlights potential security concerns and their implications for Microsoft's systems and users."
-        elif any(t.lower() in ['ai', 'copilot', 'intelligence', 'ml'] for t in topics1.union(topics2)):
+        elif any(t.lower() in ['ai', 'copilot', 'intelligence', 'ml'] for t in topics1 + topics2):
             impact = "This demonstrates Microsoft's ongoing AI initiatives and their potential impact on the technology industry."
-        elif any(t.lower() in ['revenue', 'profit', 'stock', 'market', 'financial'] for t in topics1.union(topics2)):
+        elif any(t.lower() in ['revenue', 'profit', 'stock', 'market', 'financial'] for t in topics1 + topics2):
             impact = "This shows the financial performance and market position of Microsoft in different areas."
-        elif any(t.lower() in ['partnership', 'collaboration', 'deal'] for t in topics1.union(topics2)):
+        elif any(t.lower() in ['partnership', 'collaboration', 'deal'] for t in topics1 + topics2):
             impact = "This indicates Microsoft's strategic partnerships and their potential benefits for stakeholders."
         else:
             impact = f"This reveals different aspects of Microsoft's activities in {focus1} and {focus2}, which could affect various stakeholders."
@@ -126,8 +128,8 @@ def compare_articles(articles):
     unique_topics = {t for t in unique_topics if t.lower() not in generic_topics}
     
     topic_overlap = {
-        "Common Topics": list(common_topics)[:3],
-        "Unique Topics": list(unique_topics)[:5]
+        "Common Topics": sorted(common_topics)[:3],
+        "Unique Topics": sorted(unique_topics)[:5]
     }
     
     return {
@@ -135,161 +137,522 @@ def compare_articles(articles):
         "Topic Overlap": topic_overlap
     }
 
-def fetch_news(company_name, num_articles=10):
+def get_session():
+    """Return the shared keep-alive session used for all feed requests."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(REQUEST_HEADERS)
+            _session = session
+    return _session
+
+def host_slot(url):
     """
-    Fetch news articles about a company using Google News RSS feed.
-    Returns:
-        dict: A dictionary containing either:
-            - 'articles' and 'analysis' keys with the fetched articles and their analysis
-            - 'error' key with an error message if something went wrong
+    Semaphore bounding concurrent requests to the host of a URL.
+    Held while a request waits for its response headers.
     """
-    print(f"Fetching news for {company_name}...")
-    
-    # Google News RSS feed URL
-    base_url = "https://news.google.com/rss/search"
-    
-    # Try different query formats with proper encoding
+    host = urlsplit(url).netloc
+    with _session_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+    return slot
+
+def build_queries(company_name):
+    """Build the Google News query variants for a company, in priority order."""
     queries = [
         {"q": f"{company_name} company", "desc": "company news"},
         {"q": f"{company_name} business", "desc": "business news"},
         {"q": f"{company_name} news", "desc": "general news"},
         {"q": company_name, "desc": "direct search"}  # Simple company name search
     ]
-    
-    all_articles = []
-    
     for query in queries:
+        # Properly encode the query parameters
+        query["params"] = {
+            "q": query["q"].strip(),
+            "hl": "en-US",
+            "gl": "US",
+            "ceid": "US:en"
+        }
+    return queries
+
+def open_feed(query, base_url=GOOGLE_NEWS_RSS_URL, cache=feed_cache, deadline=None, partial=False):
+    """
+    Send the request for one query variant and return once the headers arrive.
+
+    When a cache is given, fresh cached entries are returned without any
+    request and stale ones are revalidated with a conditional GET.
+    partial=True also accepts records holding only the beginning of a feed
+    (stored by stream_feed when its reader stopped early); their feed dict
+    carries a 'reopen' callable that fetches the whole feed.
+    Timeouts adapt to the host's observed latency and failed requests are
+    retried with backoff while `deadline` (an upstream.Deadline) allows.
+    While the host's circuit breaker is open, or once retries and budget
+    are used up, stale cached entries (if there are any) are served instead.
+    Returns a dict holding either cached 'entries' or an open streaming
+    'response' whose body has not been read yet, or None if the request
+    failed; the reason is then added to `deadline.failures`.
+    """
+    key = None
+    record = None
+    usable = False
+    if cache is not None:
+        key = cache.make_key(base_url, query["params"])
+        record, fresh = cache.lookup(key)
+        usable = record is not None and (partial or cache.is_complete(record))
+        if fresh and usable:
+            metrics.count("feed_cache_hits")
+            return _cached_feed(record, cache, query, base_url, deadline)
+
+    health = upstream.host_health(base_url)
+    headers = cache.conditional_headers(record) if usable else {}
+    attempt = 0
+    timeouts = 0
+    failure = "upstream_error"
+    while True:
+        # Checked before a (possibly half-open probe) slot is taken from the breaker
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            metrics.count("feed_budget_exhausted")
+            failure = "deadline_exceeded"
+            break
+        if not health.allow():
+            metrics.count("feed_circuit_open")
+            failure = "circuit_open"
+            break
+
+        timeout = health.timeout(timeouts)
+        clamped = remaining is not None and remaining < timeout
+        if clamped:
+            timeout = remaining
+
+        logger.debug("Trying %s: '%s' (timeout %.2fs)", query["desc"], query["q"], timeout)
+        metrics.count("feed_requests")
+        start = time.perf_counter()
         try:
-            # Properly encode the query parameters
-            params = {
-                "q": query["q"].strip(),
-                "hl": "en-US",
-                "gl": "US",
-                "ceid": "US:en"
-            }
-            
-            print(f"\nTrying {query['desc']}: '{query['q']}'")
-            
-            # Use requests to get the RSS feed
-            response = requests.get(
-                base_url,
-                params=params,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                },
-                timeout=10
-            )
-            
-            # Check response status
-            if response.status_code != 200:
-                print(f"Query failed with status code: {response.status_code}")
-                continue
-                
-            # Parse the feed
-            feed = feedparser.parse(response.text)
-            
-            if not feed.entries:
-                print("No entries found in feed")
+            with host_slot(base_url), metrics.stage("feed_http"):
+                response = get_session().get(base_url, params=query["params"], headers=headers,
+                                             timeout=timeout, stream=True)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Request error: %s", e)
+            failure = "upstream_error"
+            if not isinstance(e, requests.exceptions.Timeout):
+                health.record_failure()
+            elif clamped:
+                # Cut short by the request budget: says nothing about the host
+                health.release()
+                failure = "deadline_exceeded"
+            else:
+                timeouts += 1
+                health.record_failure(timeout)
+        except BaseException:
+            health.release()
+            raise
+        else:
+            # Server errors and throttling count against the host; other statuses are answers
+            if response.status_code < 500 and response.status_code != 429:
+                health.record_success(time.perf_counter() - start)
+                return _opened_feed(response, record if usable else None, key, cache, query, base_url, deadline)
+            logger.warning("Query failed with status code: %s", response.status_code)
+            response.close()
+            health.record_failure()
+            failure = "upstream_error"
+
+        # Back off before retrying, but only if a retry could still finish within the budget
+        if attempt >= FEED_RETRIES:
+            break
+        delay = upstream.backoff_delay(attempt)
+        if deadline is not None and deadline.remaining() < delay + FEED_TIMEOUT_MIN:
+            metrics.count("feed_budget_exhausted")
+            failure = "deadline_exceeded"
+            break
+        attempt += 1
+        metrics.count("feed_retries")
+        time.sleep(delay)
+
+    # The empty record close_feed leaves behind only carries validators; it is no answer
+    if record is not None and record["entries"]:
+        metrics.count("feed_stale_served")
+        logger.info("Serving stale cached feed for '%s'", query["q"])
+        return {"entries": record["entries"]}
+    if deadline is not None:
+        deadline.failures.add(failure)
+    return None
+
+def _cached_feed(record, cache, query, base_url, deadline):
+    feed = {"entries": record["entries"]}
+    if not cache.is_complete(record):
+        feed["reopen"] = lambda: open_feed(query, base_url, cache, deadline)
+    return feed
+
+def _opened_feed(response, record, key, cache, query, base_url, deadline):
+    # Unchanged since the cached copy: skip download and parsing
+    if response.status_code == 304 and record is not None:
+        response.close()
+        cache.revalidated(key)
+        metrics.count("feed_not_modified")
+        return _cached_feed(record, cache, query, base_url, deadline)
+
+    # Check response status
+    if response.status_code != 200:
+        logger.warning("Query failed with status code: %s", response.status_code)
+        response.close()
+        return None
+
+    return {"response": response, "key": key, "cache": cache}
+
+def close_feed(feed):
+    """
+    Release the connection of an opened feed, if it still holds one.
+    A feed closed before any of it was read is cached with its validators and
+    no entries, so the next request for it can be conditional.
+    """
+    if not feed or feed.get("response") is None:
+        return
+    response = feed["response"]
+    if feed["cache"] is not None and not feed.get("read") and response.status_code == 200:
+        feed["cache"].store(feed["key"], [], response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"), complete=False)
+    response.close()
+
+def read_feed(feed, cancel_event=None):
+    """
+    Download the whole body of an opened feed and parse it with feedparser.
+    Returns the list of feed entries, or None if there were none or the read was cancelled.
+    """
+    if feed is None:
+        return None
+    if "entries" in feed:
+        return feed["entries"] or None
+
+    response = feed["response"]
+    feed["read"] = True
+    try:
+        with response, metrics.stage("feed_download"):
+            chunks = []
+            for chunk in response.iter_content(chunk_size=16384):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                chunks.append(chunk)
+
+        # Parse the feed
+        with metrics.stage("feedparser"):
+            entries = feedparser.parse(b"".join(chunks)).entries
+
+        if feed["cache"] is not None:
+            feed["cache"].store(feed["key"], entries,
+                                response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+        if not entries:
+            logger.debug("No entries found in feed")
+            return None
+
+        logger.debug("Found %d articles", len(entries))
+        return entries
+
+    except requests.exceptions.RequestException as e:
+        logger.warning("Request error: %s", e)
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+    return None
+
+def stream_feed(feed):
+    """
+    Yield the entries of an opened feed while its body is still downloading.
+
+    The connection is closed as soon as the consumer stops iterating. The
+    entries read by then are cached with the response validators, marked
+    incomplete when the consumer stopped early. A feed that turns out
+    truncated is cached incomplete and without validators, so it is never
+    revalidated as is. Cached entries of an incomplete feed are followed by
+    the rest of the feed, fetched again, if the consumer keeps iterating.
+    """
+    if feed is None:
+        return
+    if "entries" in feed:
+        yield from feed["entries"]
+        if feed.get("reopen") is None:
+            return
+        metrics.count("feed_reopened")
+        seen = {entry.get("link") for entry in feed["entries"]}
+        for entry in stream_feed(feed["reopen"]()):
+            if entry.get("link") not in seen:
+                yield entry
+        return
+
+    response = feed["response"]
+    cache = feed["cache"]
+    feed["read"] = True
+    collected = [] if cache is not None else None
+    complete = False
+    validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    try:
+        for entry in iter_rss_entries(response.iter_content(chunk_size=STREAM_CHUNK_SIZE)):
+            if collected is not None:
+                collected.append(entry)
+            yield entry
+        complete = True
+    except TruncatedFeedError as e:
+        logger.warning("Truncated feed: %s", e)
+        # Without validators a 304 can never confirm the partial copy; it is fetched again in full
+        validators = (None, None)
+    except requests.exceptions.RequestException as e:
+        logger.warning("Request error: %s", e)
+        cache = None
+    finally:
+        response.close()
+        if cache is not None:
+            cache.store(feed["key"], collected, *validators, complete=complete)
+
+def fetch_feed_entries(query, base_url=GOOGLE_NEWS_RSS_URL, cancel_event=None, cache=feed_cache, deadline=None):
+    """
+    Download and parse one query variant.
+    Returns the list of feed entries, or None if the request failed or was cancelled.
+    """
+    try:
+        feed = open_feed(query, base_url, cache, deadline)
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        return None
+    return read_feed(feed, cancel_event)
+
+def _close_opened_feed(future):
+    if not future.cancelled() and future.exception() is None:
+        close_feed(future.result())
+
+def iter_query_results(queries, base_url=GOOGLE_NEWS_RSS_URL, concurrent=True, cache=feed_cache, streaming=False,
+                       deadline=None):
+    """
+    Yield (query, entries) pairs in query-priority order.
+
+    In concurrent mode every variant is requested at once over the shared
+    session, so the total wait tracks the slowest feed rather than the sum.
+    In streaming mode `entries` is a generator fed by the still-open
+    response; concurrently opened responses wait, unread, until their turn.
+    Closing the generator cancels whatever is still queued or downloading.
+    """
+    if not concurrent:
+        for query in queries:
+            if streaming:
+                yield query, stream_feed(open_feed(query, base_url, cache, deadline, partial=True))
+            else:
+                yield query, fetch_feed_entries(query, base_url, cache=cache, deadline=deadline)
+        return
+
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(len(queries), MAX_FEED_WORKERS) or 1)
+    # Feed threads report their timings to the calling request
+    if streaming:
+        futures = [executor.submit(metrics.bind(open_feed), query, base_url, cache, deadline, True)
+                   for query in queries]
+    else:
+        futures = [
+            executor.submit(metrics.bind(fetch_feed_entries), query, base_url, cancel_event, cache, deadline)
+            for query in queries
+        ]
+    try:
+        for query, future in zip(queries, futures):
+            if streaming:
+                yield query, stream_feed(future.result())
+            else:
+                yield query, future.result()
+    finally:
+        cancel_event.set()
+        for future in futures:
+            future.cancel()
+            if streaming:
+                # Close responses that were opened but never (fully) read
+                future.add_done_callback(_close_opened_feed)
+        executor.shutdown(wait=False)
+
+def entry_to_article(entry):
+    """
+    Convert a feed entry into an article dict, or None if it has no usable text.
+    The summary is added when the article is annotated (see utils.annotation).
+    """
+    # Extract content
+    with metrics.stage("clean_text"):
+        title, content = normalize_entry(entry)
+
+    # Skip if no title or content
+    if not title or not content:
+        return None
+
+    # Format publish date
+    pub_date = None
+    try:
+        if entry.get("published"):
+            pub_date = datetime.strptime(
+                entry.get("published"),
+                "%a, %d %b %Y %H:%M:%S %Z"
+            ).isoformat()
+    except Exception as e:
+        logger.debug("Date parsing error: %s", e)
+
+    # Get source
+    source = "Unknown Source"
+    if entry.get("source"):
+        source = entry["source"].get("title", "Unknown Source")
+
+    # Create article object
+    return {
+        "title": title,
+        "link": entry.get("link", ""),
+        "content": content,
+        "publish_date": pub_date,
+        "source": source
+    }
+
+def iter_articles(company_name, num_articles=10, concurrent=True, base_url=GOOGLE_NEWS_RSS_URL,
+                  use_cache=True, streaming=True, dedup=None, store=None, deadline=None):
+    """
+    Yield unique, cleaned articles about a company as soon as each is ready.
+
+    Feed entries flow one at a time through cleaning and deduplication;
+    once `num_articles` articles have been yielded the
+    remaining queries are cancelled and open connections closed. Entries
+    whose link is already in `store` (an ArticleStore) are taken from it,
+    with any derived fields, instead of being cleaned again. `deadline`
+    (an upstream.Deadline) bounds the time spent on feed requests.
+    """
+    if dedup is None:
+        dedup = Deduplicator()
+
+    found = 0
+    cache = feed_cache if use_cache else None
+    results = iter_query_results(build_queries(company_name), base_url, concurrent, cache, streaming, deadline)
+    try:
+        for query, entries in results:
+            if not entries:
                 continue
-                
-            print(f"Found {len(feed.entries)} articles")
-            
+
             # Process articles
-            for entry in feed.entries:
+            for entry in entries:
                 try:
-                    # Extract content
-                    title = clean_text(entry.get("title", ""))
-                    content = clean_text(entry.get("description", ""))
-                    
-                    # Try alternate content fields if primary is empty
-                    if not content:
-                        content = clean_text(entry.get("summary", ""))
-                    if not content:
-                        content = clean_text(entry.get("content", [{"value": ""}])[0].get("value", ""))
-                    
-                    # Skip if no title or content
-                    if not title or not content:
+                    # Skip known links before spending time cleaning the entry
+                    if dedup.check_url(entry.get("link", "")):
                         continue
-                    
-                    # Generate summary
-                    summary = extract_summary(content)
-                    
-                    # Format publish date
-                    pub_date = None
-                    try:
-                        if entry.get("published"):
-                            pub_date = datetime.strptime(
-                                entry.get("published"),
-                                "%a, %d %b %Y %H:%M:%S %Z"
-                            ).isoformat()
-                    except Exception as e:
-                        print(f"Date parsing error: {e}")
-                    
-                    # Get source
-                    source = "Unknown Source"
-                    if entry.get("source"):
-                        source = entry.source.get("title", "Unknown Source")
-                    
-                    # Create article object
-                    article = {
-                        "title": title,
-                        "link": entry.get("link", ""),
-                        "content": content,
-                        "summary": summary,
-                        "publish_date": pub_date,
-                        "source": source
-                    }
-                    
-                    # Check for duplicates
-                    if not any(a["link"] == article["link"] for a in all_articles):
-                        all_articles.append(article)
-                        print(f"Added article {len(all_articles)}: {title[:50]}...")
-                    
-                    # Break if we have enough articles
-                    if len(all_articles) >= num_articles:
-                        break
-                        
+
+                    article = store.get(entry.get("link", "")) if store is not None else None
+                    if article is None:
+                        article = entry_to_article(entry)
+                    else:
+                        metrics.count("articles_from_store")
+                    if article is None:
+                        continue
+
+                    # Check for exact and near duplicates
+                    if dedup.add(article) is not None:
+                        metrics.count("duplicates")
+                        continue
+
                 except Exception as e:
-                    print(f"Error processing article: {str(e)}")
+                    logger.warning("Error processing article: %s", e)
                     continue
-            
+
+                found += 1
+                metrics.count("articles")
+                logger.debug("Added article %d: %s...", found, article["title"][:50])
+                yield article
+
+                # Break if we have enough articles
+                if found >= num_articles:
+                    break
+
+            if streaming:
+                # Release this feed's connection before moving on
+                entries.close()
+
             # Break if we have enough articles
-            if len(all_articles) >= num_articles:
+            if found >= num_articles:
                 break
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Request error: {str(e)}")
-            continue
-        except Exception as e:
-            print(f"Unexpected error: {str(e)}")
-            continue
-    
+    finally:
+        # Cancel the lower-priority queries we no longer need
+        results.close()
+
+def no_articles_error(deadline=None):
+    """
+    Error result for a company without articles. When feed requests bounded
+    by `deadline` failed, the result names the upstream.FAILURE_REASONS entry
+    behind it as 'reason'.
+    """
+    reason = upstream.failure_reason(deadline)
+    if reason is None:
+        return {"error": "No news articles found. Please try a different company name."}
+    return {"error": NO_ARTICLES_ERRORS[reason], "reason": reason}
+
+def fetch_news(company_name, num_articles=10, concurrent=True, base_url=GOOGLE_NEWS_RSS_URL, use_cache=True,
+               similarity=DEDUP_SIMILARITY, streaming=True, analyze=True, store=None, deadline=None):
+    """
+    Fetch news articles about a company using Google News RSS feed.
+
+    With concurrent=True (the default) all query variants are fetched in
+    parallel and merged in priority order; concurrent=False keeps the old
+    one-query-at-a-time behaviour. use_cache=False bypasses the shared feed
+    cache and always downloads every feed. Articles whose links match after
+    canonicalization, or whose text fingerprints are at least `similarity`
+    alike, are dropped as duplicates. With streaming=True (the default)
+    feeds are parsed incrementally and stop downloading once enough articles
+    are collected; streaming=False parses each whole feed with feedparser.
+    analyze=False skips spaCy (the article annotation with its summaries,
+    and the comparison) so the caller can run it elsewhere (e.g. in a
+    worker process). Articles found in `store` are
+    reused as stored (see iter_articles). `deadline` is the upstream.Deadline
+    of the calling request: retries stop and stale cached feeds are served
+    once it is too close.
+    Returns:
+        dict: A dictionary containing either:
+            - 'articles' and 'analysis' keys with the fetched articles and their analysis
+            - 'error' key with an error message if something went wrong
+    """
+    logger.info("Fetching news for %s", company_name)
+
+    dedup = Deduplicator(similarity)
+    all_articles = list(iter_articles(company_name, num_articles, concurrent, base_url,
+                                      use_cache, streaming, dedup, store, deadline))
+
+    logger.debug("Deduplication: %s", dedup.stats)
+
     # Check if we found any articles
     if not all_articles:
-        print("No articles found with any query")
-        return {"error": "No news articles found. Please try a different company name."}
-    
+        logger.info("No articles found with any query")
+        return no_articles_error(deadline)
+
     # Limit to requested number of articles
     all_articles = all_articles[:num_articles]
-    
+
+    if not analyze:
+        return {
+            "articles": all_articles,
+            "analysis": {},
+            "dedup_stats": dedup.stats
+        }
+
     try:
-        # Generate article comparisons and topic analysis
+        # Annotate once (adding summaries), then compare articles and analyze topics
+        annotate_articles(all_articles)
         analysis = compare_articles(all_articles)
-        
+
         result = {
             "articles": all_articles,
-            "analysis": analysis if analysis else {}
+            "analysis": analysis if analysis else {},
+            "dedup_stats": dedup.stats
         }
-        
-        print(f"\nSuccessfully fetched and analyzed {len(all_articles)} articles")
+
+        logger.info("Successfully fetched and analyzed %d articles", len(all_articles))
         return result
-        
+
     except Exception as e:
-        print(f"Error during analysis: {str(e)}")
+        logger.exception("Error during analysis: %s", e)
         # Return articles with empty analysis if analysis fails
         return {
             "articles": all_articles,
-            "analysis": {}
+            "analysis": {},
+            "dedup_stats": dedup.stats
         }
 
 # 🔹 Run the script
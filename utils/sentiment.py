@@ -1,18 +1,151 @@
-from transformers import pipeline
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from utils.sentiment_cache import sentiment_cache
 
-# Load the improved sentiment model
-sentiment_model = pipeline("text-classification", model="cardiffnlp/twitter-roberta-base-sentiment")
+SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment"
+
+# Largest batch sent to the model and how long to wait for it to fill up
+SENTIMENT_MAX_BATCH = int(os.environ.get("SENTIMENT_MAX_BATCH", "32"))
+SENTIMENT_MAX_WAIT_MS = float(os.environ.get("SENTIMENT_MAX_WAIT_MS", "5"))
+# Texts of similar length are padded together in sub-batches of this size
+SENTIMENT_PAD_GROUP = 8
+
+LABEL_MAP = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}
+
+
+def load_sentiment_model(model=SENTIMENT_MODEL):
+    """Build the transformer text-classification pipeline."""
+    from transformers import pipeline
+
+    return pipeline("text-classification", model=model)
+
+
+class BatchingSentimentService:
+    """
+    Collects texts from all concurrent callers and classifies them together.
+
+    A background worker waits up to `max_wait_ms` (or until `max_batch_size`
+    texts are queued), sorts the batch by length so each padded sub-batch
+    holds texts of similar size, runs the model once and hands every caller
+    its own result through a Future.
+
+    Labels are memoized in the shared sentiment cache under `backend`, so
+    only texts never scored before reach the model.
+
+    :param model: Callable with the transformers pipeline signature. Loaded
+        lazily with `model_loader` when not given, so a tiny local model can
+        be injected for testing.
+    :param backend: Cache identity of the model; None disables the cache.
+    """
+
+    def __init__(self, model=None, max_batch_size=SENTIMENT_MAX_BATCH, max_wait_ms=SENTIMENT_MAX_WAIT_MS,
+                 pad_group=SENTIMENT_PAD_GROUP, model_loader=load_sentiment_model,
+                 backend=f"transformer:{SENTIMENT_MODEL}", cache=sentiment_cache):
+        self._model = model
+        self.backend = backend
+        self.cache = cache if backend else None
+        self._model_loader = model_loader
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.pad_group = pad_group
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self.stats = {"texts": 0, "batches": 0}
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._model_loader()
+        return self._model
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+                    self._worker.start()
+
+    def submit(self, text):
+        """Queue a text for classification and return a Future of its label."""
+        future = Future()
+        if not text.strip():  # Avoid empty text crashing the model
+            future.set_result("Neutral")
+            return future
+        if self.cache is not None:
+            label = self.cache.get(self.backend, text)
+            if label is not None:
+                future.set_result(label)
+                return future
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+
+    def analyze(self, text):
+        """Classify one text, batched with whatever else is in flight."""
+        return self.submit(text).result()
+
+    def analyze_many(self, texts):
+        """Classify several texts; they join the same batches as other callers."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._process(batch)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, batch):
+        # Group by length to keep padding inside each sub-batch small
+        batch = sorted(batch, key=lambda item: len(item[0]))
+        texts = [text for text, _ in batch]
+        results = self.model(texts, truncation=True, max_length=512, batch_size=self.pad_group)
+        self.stats["texts"] += len(texts)
+        self.stats["batches"] += 1
+        for (text, future), result in zip(batch, results):
+            # Default to Neutral if label is missing
+            label = LABEL_MAP.get(result["label"], "Neutral")
+            if self.cache is not None:
+                self.cache.put(self.backend, text, label)
+            future.set_result(label)
+
+
+# Shared service used by analyze_sentiment
+sentiment_service = BatchingSentimentService()
 
 
 def analyze_sentiment(text):
     """
     Perform sentiment analysis using a pre-trained transformer model.
     """
-    if not text.strip():  # Avoid empty text crashing the model
-        return "Neutral"
+    return sentiment_service.analyze(text)
 
-    result = sentiment_model(text, truncation=True, max_length=512)[0]  # Ensure full processing
-    label_map = {"LABEL_0": "Negative", "LABEL_1": "Neutral", "LABEL_2": "Positive"}
-
-    return label_map.get(result["label"], "Neutral")  # Default to Neutral if label is missing
 
+def analyze_sentiments(texts):
+    """
+    Perform sentiment analysis on several texts in shared batches.
+    """
+    return sentiment_service.analyze_many(texts)
@@ -1,17 +1,58 @@
-from textblob import TextBlob
+from importlib.metadata import PackageNotFoundError, version
 from collections import Counter
+from utils.annotation import ANNOTATION_CACHE_SIZE, annotate, annotate_texts, article_text
+from utils.article_batch import ArticleBatch
+from utils.sentiment_cache import sentiment_cache
+from utils import metrics
 
+try:
+    _TEXTBLOB_VERSION = version("textblob")
+except PackageNotFoundError:
+    _TEXTBLOB_VERSION = "unknown"
+
+# Cache identity of this backend; bump with the scoring rules below
+SENTIMENT_BACKEND = f"textblob-{_TEXTBLOB_VERSION}"
+# Scores computed from an article annotation's tokens rather than TextBlob's tokenizer
+ANNOTATION_SENTIMENT_BACKEND = f"{SENTIMENT_BACKEND}-annotation-tokens"
+
+@metrics.timed("textblob_sentiment")
 def analyze_sentiment(text):
     """
     Analyze sentiment of a given text using TextBlob.
     Returns sentiment category and score.
+    Scores are memoized by text hash, so repeated stories are not re-scored.
     """
     if not text:
         return {"category": "Neutral", "score": 0.0}
-        
-    analysis = TextBlob(text)
-    score = analysis.sentiment.polarity
-    
+
+    return dict(sentiment_cache.memoize(SENTIMENT_BACKEND, text, _score_text))
+
+@metrics.timed("textblob_sentiment")
+def sentiment_from_annotation(annotation):
+    """
+    Sentiment of an annotated article, scored on the annotation's tokens
+    with TextBlob's lexicon so the text is not tokenized again.
+    """
+    if not annotation.tokens:
+        return {"category": "Neutral", "score": 0.0}
+
+    return dict(sentiment_cache.memoize(ANNOTATION_SENTIMENT_BACKEND, annotation.text,
+                                        lambda _: _score_tokens(annotation.tokens)))
+
+def _score_text(text):
+    # Imported on first use: TextBlob pulls in NLTK, which is slow to import
+    from textblob import TextBlob
+
+    return _categorize(TextBlob(text).sentiment.polarity)
+
+def _score_tokens(tokens):
+    # The pattern lexicon behind TextBlob's default analyzer scores a word list directly
+    from textblob.en import sentiment as pattern_sentiment
+
+    polarity, _ = pattern_sentiment([text.lower() for text, _ in tokens])
+    return _categorize(polarity)
+
+def _categorize(score):
     # Categorize sentiment
     if score > 0.1:
         category = "Positive"
@@ -29,50 +70,89 @@ def compare_sentiment(articles):
     """
     Compare sentiment across multiple articles.
     Returns sentiment distribution and overall sentiment.
+    Accepts article dicts or an ArticleBatch (see compare_sentiment_batch).
     """
-    if not articles:
-        return {
-            "sentiment_distribution": {
-                "Positive": 0,
-                "Negative": 0,
-                "Neutral": 0
-            },
-            "overall_sentiment": {
-                "category": "Neutral",
-                "score": 0.0
-            }
-        }
-    
-    # Analyze sentiment for each article
-    sentiments = []
-    total_score = 0.0
-    
+    if isinstance(articles, ArticleBatch):
+        return compare_sentiment_batch(articles)
+
+    accumulator = SentimentAccumulator()
     for article in articles:
-        # Combine title and content for better sentiment analysis
-        text = f"{article.get('title', '')} {article.get('content', '')}"
-        sentiment = analyze_sentiment(text)
-        sentiments.append(sentiment["category"])
-        total_score += sentiment["score"]
-        
+        accumulator.add(article)
+    return accumulator.result()
+
+def compare_sentiment_batch(batch):
+    """
+    Large-corpus form of compare_sentiment over an ArticleBatch.
+    Unscored rows are scored into the batch's sentiment columns the same
+    way article dicts are (sentiment_from_annotation), annotated in chunks
+    that fit the annotation memo, and the summary is computed with array
+    reductions.
+    """
+    import numpy as np
+
+    unscored = np.flatnonzero(np.frombuffer(batch.sentiment_category, dtype=np.int8) < 0)
+    for start in range(0, len(unscored), ANNOTATION_CACHE_SIZE):
+        rows = unscored[start:start + ANNOTATION_CACHE_SIZE]
+        texts, content_starts = zip(*(
+            article_text({"title": batch.value("title", i), "content": batch.value("content", i)}) for i in rows
+        ))
+        for i, annotation in zip(rows, annotate_texts(list(texts), list(content_starts))):
+            batch.set_sentiment(i, sentiment_from_annotation(annotation))
+    return batch.sentiment_summary()
+
+class SentimentAccumulator:
+    """
+    Incremental form of compare_sentiment: articles are scored as they are
+    added and result() returns the same summary compare_sentiment would.
+    """
+
+    def __init__(self):
+        self.sentiments = []
+        self.total_score = 0.0
+
+    def add(self, article):
+        """Score one article (unless already scored), attach its sentiment and return it."""
+        sentiment = article.get("sentiment")
+        if sentiment is None:
+            # Scored on title and content, from the article's shared annotation
+            sentiment = sentiment_from_annotation(annotate(article))
+        self.sentiments.append(sentiment["category"])
+        self.total_score += sentiment["score"]
+
         # Add sentiment to article
         article["sentiment"] = sentiment
-    
-    # Calculate sentiment distribution
-    sentiment_counts = Counter(sentiments)
-    sentiment_distribution = {
-        "Positive": sentiment_counts.get("Positive", 0),
-        "Negative": sentiment_counts.get("Negative", 0),
-        "Neutral": sentiment_counts.get("Neutral", 0)
-    }
-    
-    # Calculate overall sentiment
-    avg_score = total_score / len(articles)
-    overall_category = "Positive" if avg_score > 0.1 else "Negative" if avg_score < -0.1 else "Neutral"
-    
-    return {
-        "sentiment_distribution": sentiment_distribution,
-        "overall_sentiment": {
-            "category": overall_category,
-            "score": round(avg_score, 2)
+        return sentiment
+
+    def result(self):
+        if not self.sentiments:
+            return {
+                "sentiment_distribution": {
+                    "Positive": 0,
+                    "Negative": 0,
+                    "Neutral": 0
+                },
+                "overall_sentiment": {
+                    "category": "Neutral",
+                    "score": 0.0
+                }
+            }
+
+        # Calculate sentiment distribution
+        sentiment_counts = Counter(self.sentiments)
+        sentiment_distribution = {
+            "Positive": sentiment_counts.get("Positive", 0),
+            "Negative": sentiment_counts.get("Negative", 0),
+            "Neutral": sentiment_counts.get("Neutral", 0)
+        }
+
+        # Calculate overall sentiment
+        avg_score = self.total_score / len(self.sentiments)
+        overall_category = "Positive" if avg_score > 0.1 else "Negative" if avg_score < -0.1 else "Neutral"
+
+        return {
+            "sentiment_distribution": sentiment_distribution,
+            "overall_sentiment": {
+                "category": overall_category,
+                "score": round(avg_score, 2)
+            }
         }
-    }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# SQLite file shared by all workers; set SENTIMENT_CACHE_PATH="" to keep scores in memory only
+SENTIMENT_CACHE_PATH = os.environ.get("SENTIMENT_CACHE_PATH", os.path.join("cache", "sentiment_cache.sqlite3"))
+# Scores kept in the in-process LRU in front of SQLite
+SENTIMENT_CACHE_SIZE = int(os.environ.get("SENTIMENT_CACHE_SIZE", "10000"))
+
+
+def normalize_text(text):
+    """Collapse whitespace so formatting-only differences share a cache entry."""
+    return " ".join(text.split())
+
+
+def cache_key(backend, text):
+    """Hash of the backend identity and normalized text."""
+    return hashlib.sha256(f"{backend}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Memo of sentiment scores keyed by backend identity and text hash.
+
+    Lookups go to an in-process LRU first and then to a SQLite table, so
+    scores survive restarts and are shared between worker processes.
+
+    :param path: SQLite file, or None/"" for an in-memory-only cache.
+    :param max_entries: Size of the in-process LRU.
+    """
+
+    def __init__(self, path=SENTIMENT_CACHE_PATH, max_entries=SENTIMENT_CACHE_SIZE):
+        self.path = path or None
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment "
+                "(key TEXT PRIMARY KEY, backend TEXT, value TEXT, created_at REAL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, backend, text):
+        """Return the cached score for a text, or None."""
+        key = cache_key(backend, text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+        value = None
+        if self.path:
+            try:
+                row = self._connection().execute(
+                    "SELECT value FROM sentiment WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    value = json.loads(row[0])
+            except sqlite3.Error as e:
+                logger.warning("Sentiment cache read error: %s", e)
+
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["disk_hits"] += 1
+                self._remember(key, value)
+        return value
+
+    def put(self, backend, text, value):
+        """Store a score in memory and, if configured, in SQLite."""
+        key = cache_key(backend, text)
+        with self._lock:
+            self._remember(key, value)
+        if self.path:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO sentiment (key, backend, value, created_at) VALUES (?, ?, ?, ?)",
+                        (key, backend, json.dumps(value), time.time())
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Sentiment cache write error: %s", e)
+
+    def memoize(self, backend, text, score):
+        """Return the cached score for text, computing it with score(text) on a miss."""
+        value = self.get(backend, text)
+        if value is None:
+            value = score(text)
+            self.put(backend, text, value)
+        return value
+
+    def stats(self):
+        """Return hit/miss counters and the overall hit rate."""
+        with self._lock:
+            stats = dict(self._stats, size=len(self._memory))
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Shared cache used by both sentiment backends
+sentiment_cache = SentimentCache()
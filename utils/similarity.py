@@ -0,0 +1,79 @@
+import numpy as np
+from scipy import sparse
+
+
+def term_matrix(term_lists, weighting="tfidf"):
+    """
+    Build a sparse article-by-term matrix with L2-normalized rows.
+
+    :param term_lists: One list of terms (key points, topics) per article;
+        terms are compared case-insensitively.
+    :param weighting: "tfidf" down-weights terms shared by many articles,
+        "binary" counts every term once.
+    :return: (csr_matrix, vocabulary) with the vocabulary sorted, so the
+        same input always gives the same matrix.
+    """
+    if weighting not in ("tfidf", "binary"):
+        raise ValueError(f"Unknown weighting: {weighting}")
+
+    rows = [sorted({term.strip().lower() for term in terms if term and term.strip()}) for terms in term_lists]
+    vocabulary = sorted({term for row in rows for term in row})
+    index = {term: i for i, term in enumerate(vocabulary)}
+
+    row_ids = np.repeat(np.arange(len(rows)), [len(row) for row in rows])
+    col_ids = np.array([index[term] for row in rows for term in row], dtype=np.int64)
+    data = np.ones(len(col_ids))
+    matrix = sparse.csr_matrix((data, (row_ids, col_ids)), shape=(len(rows), len(vocabulary)))
+
+    if weighting == "tfidf" and vocabulary:
+        df = np.asarray((matrix > 0).sum(axis=0)).ravel()
+        idf = np.log((1 + len(rows)) / (1 + df)) + 1
+        matrix = matrix @ sparse.diags(idf)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix), vocabulary
+
+
+def similarity_matrix(matrix):
+    """Cosine similarity of every pair of rows, as a dense N x N array."""
+    return (matrix @ matrix.T).toarray()
+
+
+def rank_pairs(term_lists, k=5, weighting="tfidf"):
+    """
+    Score all article pairs at once and pick the top-k of each kind.
+
+    Articles without any terms are left out of both lists, so they are
+    never reported as contrasting with everything else. Ties are broken by
+    article index, so the result does not depend on anything but the input;
+    when no two articles share a term, every pair scores 0 and the
+    contrasting pairs are simply the first k pairs in index order.
+    :return: {"contrasting": [...], "similar": [...]}, lists of
+        (i, j, similarity) with i < j; contrasting pairs have the lowest
+        similarity first, similar pairs (similarity > 0) the highest first.
+    """
+    matrix, _ = term_matrix(term_lists, weighting)
+    n = matrix.shape[0]
+    if n < 2:
+        return {"contrasting": [], "similar": []}
+
+    scores = similarity_matrix(matrix)
+    first, second = np.triu_indices(n, 1)
+    has_terms = np.diff(matrix.indptr) > 0
+    keep = has_terms[first] & has_terms[second]
+    first, second = first[keep], second[keep]
+    pair_scores = scores[first, second]
+
+    def top(order, mask=None):
+        if mask is not None:
+            order = order[mask[order]]
+        return [(int(first[p]), int(second[p]), round(float(pair_scores[p]), 4)) for p in order[:k]]
+
+    # lexsort sorts by the last key first
+    contrasting = np.lexsort((second, first, pair_scores))
+    similar = np.lexsort((second, first, -pair_scores))
+    return {
+        "contrasting": top(contrasting),
+        "similar": top(similar, pair_scores > 0)
+    }
@@ -0,0 +1,90 @@
+import html
+import re
+from bs4 import BeautifulSoup
+
+_WHITESPACE = re.compile(r'\s+')
+_SPECIAL_CHARS = re.compile(r'[^\w\s.,!?-]')
+
+# Simple tags Google News puts in titles and descriptions (anchors, fonts,
+# cluster lists). Attribute values may be quoted and contain '>'.
+_SIMPLE_TAG = re.compile(
+    r'</?(?:a|b|br|div|em|font|i|li|ol|p|span|strong|u|ul)'
+    r'(?:\s+[^\s"\'<>/=]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s"\'<>]+))?)*\s*/?>',
+    re.IGNORECASE
+)
+
+# An '&' that BeautifulSoup could still decode as an entity
+_ENTITY_LIKE = re.compile(r'&[#\w]')
+
+stats = {"plain": 0, "simple_markup": 0, "soup": 0}
+
+
+def strip_markup(text):
+    """
+    Remove HTML markup from already unescaped text.
+
+    Plain text is returned as is. Text with only simple inline tags is
+    stripped with a regex; anything else (comments, scripts, leftover
+    entities, stray '<') falls back to a full BeautifulSoup parse.
+    """
+    has_entity = "&" in text and _ENTITY_LIKE.search(text) is not None
+    if "<" not in text and not has_entity:
+        stats["plain"] += 1
+        return text
+
+    if not has_entity:
+        stripped = _SIMPLE_TAG.sub("", text)
+        if "<" not in stripped:
+            stats["simple_markup"] += 1
+            return stripped
+
+    stats["soup"] += 1
+    return BeautifulSoup(text, "html.parser").get_text()
+
+
+def normalize_text(text):
+    """Clean and normalize text content."""
+    if not text:
+        return ""
+    # Decode HTML entities
+    text = html.unescape(text)
+    # Remove HTML tags
+    text = strip_markup(text)
+    # Remove extra whitespace
+    text = _WHITESPACE.sub(' ', text).strip()
+    # Remove special characters but keep punctuation
+    return _SPECIAL_CHARS.sub('', text)
+
+
+def normalize_entry(entry, memo=None):
+    """
+    Return the cleaned (title, content) of a feed entry.
+    Content falls back from description to summary to the first content value.
+    """
+    def clean(value):
+        if memo is None:
+            return normalize_text(value)
+        if value not in memo:
+            memo[value] = normalize_text(value)
+        return memo[value]
+
+    title = clean(entry.get("title", ""))
+    content = clean(entry.get("description", ""))
+
+    # Try alternate content fields if primary is empty
+    if not content:
+        content = clean(entry.get("summary", ""))
+    if not content:
+        content = clean(entry.get("content", [{"value": ""}])[0].get("value", ""))
+
+    return title, content
+
+
+def normalize_entries(entries):
+    """
+    Clean a whole feed's entries at once.
+    Identical raw strings (common between description and summary) are
+    cleaned only once per batch.
+    """
+    memo = {}
+    return [normalize_entry(entry, memo) for entry in entries]
@@ -1,10 +1,9 @@
-from gtts import gTTS
+from utils.tts_generator import tts_cache
 
 def generate_tts(text, language="hi"):
     """
     Convert text to Hindi speech using gTTS.
+    Returns the path of the cached audio file for this text.
     """
     text = " ".join(text.split())  # Clean text to remove unnecessary spaces
-    tts = gTTS(text=text, lang=language, slow=False)
-    tts.save("output.mp3")
-    return "output.mp3"
+    return tts_cache.get_or_create(text, language)
@@ -1,8 +1,147 @@
-from gtts import gTTS
+import hashlib
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from utils import metrics
 
+# Directory holding generated audio, one file per distinct text and language
+TTS_OUTPUT_DIR = os.environ.get("TTS_OUTPUT_DIR", "tts_outputs")
+# Total size of cached audio before the least recently used files are removed
+TTS_CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
 
-def generate_tts(text, language="hi", output_dir="tts_outputs"):
+
+@metrics.timed("gtts")
+def gtts_synthesize(text, language, fp):
+    """Write gTTS speech for text into a binary file object."""
+    from gtts import gTTS
+
+    gTTS(text=text, lang=language, slow=False).write_to_fp(fp)
+
+
+class TTSCache:
+    """
+    Content-addressed store of synthesized audio.
+
+    Files are named by a hash of the language and text, so identical
+    summaries are synthesized once and concurrent requests never share a
+    file name for different audio. Audio is written to a temporary file and
+    atomically renamed into place. When the directory grows beyond
+    `max_bytes`, the least recently used files are deleted, except files
+    that are being created or opened at that moment; a file opened with
+    `open_audio` stays readable after it is evicted.
+
+    :param synthesizer: Callable (text, language, fp) writing audio bytes;
+        swap in a stub to run without network access.
+    """
+
+    def __init__(self, output_dir=TTS_OUTPUT_DIR, max_bytes=TTS_CACHE_MAX_BYTES, synthesizer=gtts_synthesize):
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.synthesizer = synthesizer
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(text, language):
+        return hashlib.sha256(f"{language}\0{text}".encode("utf-8")).hexdigest()
+
+    def path_for(self, text, language):
+        return os.path.join(self.output_dir, f"{self.content_hash(text, language)}.mp3")
+
+    @contextmanager
+    def _locked(self, path, blocking=True):
+        """
+        Hold the lock of one file; yields whether it was acquired.
+        Lock entries are dropped once no caller uses them.
+        """
+        with self._locks_lock:
+            entry = self._locks.setdefault(path, [threading.Lock(), 0])
+            entry[1] += 1
+        acquired = entry[0].acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                entry[0].release()
+            with self._locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[path]
+
+    def _ensure(self, path, text, language):
+        # Called with the file's lock held; returns whether the file was created
+        if os.path.exists(path):
+            # Refresh the access time used for LRU eviction
+            os.utime(path)
+            return False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                self.synthesizer(text, language, fp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+
+    def get_or_create(self, text, language="hi"):
+        """Return the path of the audio for text, synthesizing it only if not cached."""
+        path = self.path_for(text, language)
+        with self._locked(path):
+            created = self._ensure(path, text, language)
+        if created:
+            self.evict(keep=path)
+        return path
+
+    def open_audio(self, text, language="hi"):
+        """
+        Return the audio for text as an open binary file, synthesizing it only if not cached.
+        The file is opened before eviction can remove it, so it is safe to stream.
+        """
+        path = self.path_for(text, language)
+        with self._locked(path):
+            created = self._ensure(path, text, language)
+            f = open(path, "rb")
+        if created:
+            self.evict(keep=path)
+        return f
+
+    def evict(self, keep=None):
+        """Delete least recently used audio until the directory fits in max_bytes."""
+        files = []
+        for entry in os.scandir(self.output_dir):
+            if entry.name.endswith(".mp3") and entry.path != keep:
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        if keep and os.path.exists(keep):
+            total += os.path.getsize(keep)
+
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            # Skip files another thread is creating or opening right now
+            with self._locked(path, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    total -= size
+                except OSError:
+                    # Open files cannot be removed on Windows; retry on the next eviction
+                    pass
+
+
+# Shared cache used by generate_tts
+tts_cache = TTSCache()
+
+
+def generate_tts(text, language="hi", output_dir=TTS_OUTPUT_DIR):
     """
     Generates a Text-to-Speech (TTS) audio file in Hindi.
 
@@ -14,14 +153,25 @@ def generate_tts(text, language="hi", output_dir="tts_outputs"):
     if not text:
         return None
 
-    # Ensure the output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    cache = tts_cache if output_dir == tts_cache.output_dir else TTSCache(output_dir)
+    return cache.get_or_create(text, language)
+
 
-    # Generate filename
-    file_path = os.path.join(output_dir, "summary_hindi.mp3")
+def open_tts(text, language="hi"):
+    """
+    Like generate_tts, but returns the audio as an open binary file (or None
+    for empty text), which stays readable even if the cache evicts it.
+    """
+    if not text:
+        return None
+    return tts_cache.open_audio(text, language)
 
-    # Generate TTS audio
-    tts = gTTS(text=text, lang=language, slow=False)
-    tts.save(file_path)
 
-    return file_path
+def iter_file(f, chunk_size=64 * 1024):
+    """Yield the bytes of an open binary file in chunks and close it, for streaming responses."""
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,166 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# Seconds an API request may spend waiting on feed hosts
+FETCH_BUDGET = float(os.environ.get("FETCH_BUDGET", "15"))
+# Bounds of the per-request feed timeout; the upper one is used until enough latencies are observed
+FEED_TIMEOUT_MIN = float(os.environ.get("FEED_TIMEOUT_MIN", "1"))
+FEED_TIMEOUT_MAX = float(os.environ.get("FEED_TIMEOUT_MAX", "10"))
+# Feed timeout = observed p95 response latency x this factor
+FEED_TIMEOUT_FACTOR = float(os.environ.get("FEED_TIMEOUT_FACTOR", "3"))
+# Retries of a failed feed request, spaced by jittered exponential backoff from this base (seconds)
+FEED_RETRIES = int(os.environ.get("FEED_RETRIES", "2"))
+FEED_BACKOFF_BASE = float(os.environ.get("FEED_BACKOFF_BASE", "0.2"))
+# Consecutive failures that open a host's circuit, and seconds before it is probed again
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "30"))
+
+# Latencies kept per host, and the fewest needed before timeouts adapt
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+# Why feed requests came back empty, most significant first
+FAILURE_REASONS = ("deadline_exceeded", "circuit_open", "upstream_error")
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+
+class Deadline:
+    """
+    Point in time by which a request's upstream work has to finish.
+    Feed requests it bounds add the reason they failed (see FAILURE_REASONS)
+    to `failures`, so an empty result can be told apart from a quiet feed.
+    """
+
+    __slots__ = ("expires_at", "failures")
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+        self.failures = set()
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+
+class HostHealth:
+    """
+    Observed latency and circuit breaker state of one feed host.
+
+    Timeouts follow the host's p95 response latency and double with each
+    retry after a timeout. After `failures` consecutive failed requests the
+    circuit opens and requests fail fast; once `cooldown` seconds have
+    passed a single probe request is let through, and its outcome closes or
+    reopens the circuit. A probe that ends without an outcome is handed
+    back with `release`.
+    """
+
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.probing else "open"
+
+    def timeout(self, timeouts=0):
+        """
+        Seconds to wait for a response: p95 latency x FEED_TIMEOUT_FACTOR, within
+        the configured bounds, doubled for each earlier attempt that timed out.
+        """
+        with self._lock:
+            if len(self.latencies) < MIN_LATENCY_SAMPLES:
+                return FEED_TIMEOUT_MAX
+            ordered = sorted(self.latencies)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return min(FEED_TIMEOUT_MAX, max(FEED_TIMEOUT_MIN, p95 * FEED_TIMEOUT_FACTOR) * 2 ** timeouts)
+
+    def allow(self):
+        """Whether a request may be sent now; False while the circuit is open."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.probing = True
+            return True
+
+    def release(self):
+        """Hand back a probe allowed by `allow` whose request was not sent or told nothing about the host."""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self, latency):
+        with self._lock:
+            self.latencies.append(latency)
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self, timed_out_after=None):
+        """
+        Count a failed request. A timeout is also kept as a latency sample, so
+        timeouts grow when the host slows down instead of failing every request.
+        Only timeouts of FEED_TIMEOUT_MAX count against the circuit; a shorter,
+        adaptive one shows the wait was too short, not that the host is down.
+        """
+        with self._lock:
+            if timed_out_after is not None:
+                self.latencies.append(timed_out_after)
+                if timed_out_after < FEED_TIMEOUT_MAX:
+                    self.probing = False
+                    return
+            self.consecutive_failures += 1
+            if self.probing or self.consecutive_failures >= self.failures:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.consecutive_failures,
+                    "samples": len(self.latencies)}
+
+
+def host_health(url):
+    """Shared HostHealth of the host of a URL."""
+    host = urlsplit(url).netloc
+    with _hosts_lock:
+        health = _hosts.get(host)
+        if health is None:
+            health = _hosts[host] = HostHealth()
+    return health
+
+
+def failure_reason(deadline):
+    """The most significant reason feed requests bounded by a deadline failed, or None."""
+    if deadline is not None:
+        for reason in FAILURE_REASONS:
+            if reason in deadline.failures:
+                return reason
+    return None
+
+
+def backoff_delay(attempt, base=FEED_BACKOFF_BASE, rng=random):
+    """Full-jitter exponential backoff: a random delay up to base * 2**attempt."""
+    return rng.uniform(0, base * 2 ** attempt)
+
+
+def stats():
+    """Circuit state, failure streak and latency sample count per feed host."""
+    with _hosts_lock:
+        hosts = dict(_hosts)
+    return {host: health.stats() for host, health in hosts.items()}
@@ -0,0 +1,74 @@
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Backends preloaded by warm_up, comma-separated (spacy, yake, textblob, gtts)
+WARMUP_BACKENDS = [
+    name.strip() for name in os.environ.get("WARMUP_BACKENDS", "spacy,yake,textblob").split(",")
+    if name.strip()
+]
+
+
+def _spacy():
+    from utils.nlp_models import get_nlp
+
+    get_nlp()
+
+
+def _yake():
+    from utils.extract_topics import extract_topics
+
+    extract_topics("Warm-up text so the keyword extractor is ready for requests.")
+
+
+def _textblob():
+    from utils.sentiment_analysis import _score_text
+
+    _score_text("Warm-up text.")
+
+
+def _gtts():
+    import gtts  # noqa: F401
+
+
+BACKENDS = {
+    "spacy": _spacy,
+    "yake": _yake,
+    "textblob": _textblob,
+    "gtts": _gtts,
+}
+
+# Outcome of the last warm_up in this process, reported by /ready
+state = {"ready": False, "finished": False, "backends": {}}
+
+
+def warm_up(backends=None):
+    """
+    Load each backend once so the first request does not pay for it.
+    A failing backend is logged and reported but does not stop the others.
+    Returns {name: {"ok", "seconds", ["error"]}}.
+    """
+    results = {}
+    for name in WARMUP_BACKENDS if backends is None else backends:
+        step = BACKENDS.get(name)
+        start = time.perf_counter()
+        try:
+            if step is None:
+                raise ValueError(f"Unknown warm-up backend: {name}")
+            step()
+            result = {"ok": True}
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %s", name, e)
+            result = {"ok": False, "error": str(e)}
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        results[name] = result
+    return results
+
+
+def mark_finished(results):
+    """Record warm-up results; the process is ready only if every backend loaded."""
+    state["backends"] = results
+    state["finished"] = True
+    state["ready"] = all(result["ok"] for result in results.values())